@@ -0,0 +1,91 @@
+"""
+Baked archetype mapping data.
+
+AUTO-GENERATED by scripts/bake_archetypes.py from
+data/archetype_mapping.yaml -- do not edit by hand.
+"""
+
+SPECIES_ARCHETYPES = {'American Crow': 'wise observer',
+ 'American Goldfinch': 'sunny socialite',
+ 'American Redstart': 'flashy dancer',
+ 'American Robin': 'cheerful neighbor',
+ 'Black-capped Chickadee': 'acrobatic entertainer',
+ 'Blue Jay': 'clever troublemaker',
+ 'Brown-headed Cowbird': 'mysterious wanderer',
+ 'Common Grackle': 'street-smart survivor',
+ 'Common Yellowthroat': 'secretive spy',
+ 'Downy Woodpecker': 'persistent craftsman',
+ 'Eastern Bluebird': 'gentle optimist',
+ 'Eurasian Collared-Dove': 'polite newcomer',
+ 'European Starling': 'versatile mimic',
+ 'House Finch': 'friendly chatterbox',
+ 'House Sparrow': 'busy worker',
+ 'Mourning Dove': 'gentle peacekeeper',
+ 'Northern Cardinal': 'bold gossip',
+ 'Pileated Woodpecker': 'master carpenter',
+ 'Purple Finch': 'sophisticated visitor',
+ 'Pyrrhuloxia': 'desert sage',
+ 'Red-bellied Woodpecker': 'energetic builder',
+ 'Red-winged Blackbird': 'territorial performer',
+ 'Rock Pigeon': 'urban survivor',
+ 'Song Sparrow': 'local storyteller',
+ "Steller's Jay": 'mountain trickster',
+ 'Tufted Titmouse': 'curious explorer',
+ 'White-breasted Nuthatch': 'upside-down comedian',
+ 'White-throated Sparrow': 'quiet musician',
+ 'Wood Thrush': 'forest philosopher',
+ 'Yellow Warbler': 'energetic traveler'}
+
+ARCHETYPE_DESCRIPTIONS = {'acrobatic entertainer': 'Playful and athletic, delighting audiences with '
+                          'their antics.',
+ 'bold gossip': 'Confident and social, always ready with the latest news from '
+                'around the neighborhood.',
+ 'busy worker': 'Industrious and practical, always building or gathering.',
+ 'cheerful neighbor': 'Friendly and reliable, the first to greet you in the '
+                      'morning.',
+ 'clever troublemaker': 'Intelligent and mischievous, always finding creative '
+                        'solutions (and problems).',
+ 'curious explorer': 'Inquisitive and adventurous, always investigating '
+                     'something new.',
+ 'desert sage': 'Wise and adapted, sharing ancient knowledge of survival in '
+                'harsh lands.',
+ 'energetic builder': 'Dynamic and creative, always working on the next '
+                      'project.',
+ 'energetic traveler': 'Restless and vibrant, bringing stories from distant '
+                       'places.',
+ 'flashy dancer': 'Graceful and showy, expressing themselves through movement.',
+ 'forest philosopher': "Contemplative and deep, pondering life's mysteries "
+                       'among the trees.',
+ 'friendly chatterbox': 'Talkative and warm, never meeting a stranger.',
+ 'gentle optimist': 'Soft-spoken and hopeful, always seeing the bright side.',
+ 'gentle peacekeeper': 'Calm and soothing, bringing tranquility to tense '
+                       'situations.',
+ 'local storyteller': 'Knowledgeable and engaging, full of tales about the '
+                      'area.',
+ 'master carpenter': 'Expert and powerful, creating impressive architectural '
+                     'works.',
+ 'mountain trickster': 'Playful and resourceful, using wit and cunning in high '
+                       'places.',
+ 'mysterious wanderer': 'Enigmatic and unpredictable, following their own '
+                        'path.',
+ 'persistent craftsman': 'Skilled and determined, perfecting their art through '
+                         'repetition.',
+ 'polite newcomer': 'Courteous and well-mannered, fitting in while maintaining '
+                    'their identity.',
+ 'quiet musician': 'Talented and modest, sharing beautiful songs when the mood '
+                   'strikes.',
+ 'secretive spy': 'Elusive and observant, gathering intelligence from the '
+                  'shadows.',
+ 'sophisticated visitor': 'Refined and cultured, gracing us with their '
+                          'presence.',
+ 'street-smart survivor': 'Adaptable and tough, thriving in urban '
+                          'environments.',
+ 'sunny socialite': 'Bright and gregarious, bringing joy to every gathering.',
+ 'territorial performer': 'Bold and dramatic, defending their stage with '
+                          'passion.',
+ 'upside-down comedian': 'Quirky and amusing, finding humor in unique '
+                         'perspectives.',
+ 'urban survivor': 'Hardy and practical, making the best of city life.',
+ 'versatile mimic': 'Talented and adaptable, learning new tricks constantly.',
+ 'wise observer': 'Thoughtful and perceptive, watching the world with knowing '
+                  'eyes.'}
@@ -3,14 +3,124 @@ Character archetype mapping system.
 
 Maps bird species to personality archetypes for storytelling.
 """
+import copy
 import json
+import os
+import tempfile
+import types
 import yaml
+from collections import OrderedDict
 from pathlib import Path
 from typing import Dict, Optional, List
 import logging
 
+try:
+    # libyaml C loader parses roughly an order of magnitude faster
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# LRU cache of parsed mapping files: path -> (mtime, size, data dict).
+# Repeated ArchetypeMapper construction (tests, worker reloads, CLI
+# tools) then skips file I/O and parsing entirely.
+_MAPPING_CACHE: "OrderedDict[str, tuple]" = OrderedDict()
+_MAPPING_CACHE_MAX = 100
+
+# Default archetype mapping used when no mapping file is available.
+# MappingProxyType keeps the shared defaults immutable; instances copy
+# them into plain dicts.
+_DEFAULT_SPECIES_ARCHETYPES = types.MappingProxyType({
+    # Cardinals and allies - Bold personalities
+    "Northern Cardinal": "bold gossip",
+    "Pyrrhuloxia": "desert sage",
+    
+    # Jays and crows - Intelligent troublemakers
+    "Blue Jay": "clever troublemaker",
+    "Steller's Jay": "mountain trickster",
+    "American Crow": "wise observer", 
+    "Common Grackle": "street-smart survivor",
+    
+    # Robins and thrushes - Friendly neighbors
+    "American Robin": "cheerful neighbor",
+    "Eastern Bluebird": "gentle optimist",
+    "Wood Thrush": "forest philosopher",
+    
+    # Sparrows - Humble workers
+    "House Sparrow": "busy worker",
+    "White-throated Sparrow": "quiet musician",
+    "Song Sparrow": "local storyteller",
+    
+    # Finches - Social butterflies
+    "American Goldfinch": "sunny socialite", 
+    "House Finch": "friendly chatterbox",
+    "Purple Finch": "sophisticated visitor",
+    
+    # Woodpeckers - Industrious builders
+    "Downy Woodpecker": "persistent craftsman",
+    "Red-bellied Woodpecker": "energetic builder",
+    "Pileated Woodpecker": "master carpenter",
+    
+    # Blackbirds - Dramatic performers
+    "Red-winged Blackbird": "territorial performer",
+    "European Starling": "versatile mimic",
+    "Brown-headed Cowbird": "mysterious wanderer",
+    
+    # Doves and pigeons - Peaceful mediators
+    "Mourning Dove": "gentle peacekeeper",
+    "Rock Pigeon": "urban survivor",
+    "Eurasian Collared-Dove": "polite newcomer",
+    
+    # Chickadees and nuthatches - Acrobatic entertainers
+    "Black-capped Chickadee": "acrobatic entertainer",
+    "White-breasted Nuthatch": "upside-down comedian",
+    "Tufted Titmouse": "curious explorer",
+    
+    # Warblers - Energetic travelers
+    "Yellow Warbler": "energetic traveler",
+    "American Redstart": "flashy dancer",
+    "Common Yellowthroat": "secretive spy",
+})
+
+_DEFAULT_ARCHETYPE_DESCRIPTIONS = types.MappingProxyType({
+    "bold gossip": "Confident and social, always ready with the latest news from around the neighborhood.",
+    "desert sage": "Wise and adapted, sharing ancient knowledge of survival in harsh lands.",
+    "clever troublemaker": "Intelligent and mischievous, always finding creative solutions (and problems).",
+    "mountain trickster": "Playful and resourceful, using wit and cunning in high places.",
+    "wise observer": "Thoughtful and perceptive, watching the world with knowing eyes.",
+    "street-smart survivor": "Adaptable and tough, thriving in urban environments.",
+    "cheerful neighbor": "Friendly and reliable, the first to greet you in the morning.",
+    "gentle optimist": "Soft-spoken and hopeful, always seeing the bright side.",
+    "forest philosopher": "Contemplative and deep, pondering life's mysteries among the trees.",
+    "busy worker": "Industrious and practical, always building or gathering.",
+    "quiet musician": "Talented and modest, sharing beautiful songs when the mood strikes.",
+    "local storyteller": "Knowledgeable and engaging, full of tales about the area.",
+    "sunny socialite": "Bright and gregarious, bringing joy to every gathering.",
+    "friendly chatterbox": "Talkative and warm, never meeting a stranger.",
+    "sophisticated visitor": "Refined and cultured, gracing us with their presence.",
+    "persistent craftsman": "Skilled and determined, perfecting their art through repetition.",
+    "energetic builder": "Dynamic and creative, always working on the next project.",
+    "master carpenter": "Expert and powerful, creating impressive architectural works.",
+    "territorial performer": "Bold and dramatic, defending their stage with passion.",
+    "versatile mimic": "Talented and adaptable, learning new tricks constantly.",
+    "mysterious wanderer": "Enigmatic and unpredictable, following their own path.",
+    "gentle peacekeeper": "Calm and soothing, bringing tranquility to tense situations.",
+    "urban survivor": "Hardy and practical, making the best of city life.",
+    "polite newcomer": "Courteous and well-mannered, fitting in while maintaining their identity.",
+    "acrobatic entertainer": "Playful and athletic, delighting audiences with their antics.",
+    "upside-down comedian": "Quirky and amusing, finding humor in unique perspectives.",
+    "curious explorer": "Inquisitive and adventurous, always investigating something new.",
+    "energetic traveler": "Restless and vibrant, bringing stories from distant places.",
+    "flashy dancer": "Graceful and showy, expressing themselves through movement.",
+    "secretive spy": "Elusive and observant, gathering intelligence from the shadows."
+})
+
 
 class ArchetypeMapper:
     """Maps bird species to character archetypes."""
@@ -25,9 +135,29 @@ class ArchetypeMapper:
         self.mapping_file = mapping_file or "data/archetype_mapping.yaml"
         self.species_archetypes = {}
         self.archetype_descriptions = {}
-        
+        # Inverted archetype -> species index, built lazily on first use
+        self._archetype_index = None
+
+        # The default mapping ships pre-baked as a Python module
+        # (scripts/bake_archetypes.py); importing it skips YAML parsing
+        # entirely. Custom mapping files still go through _load_mapping.
+        if mapping_file is None and self._load_baked_mapping():
+            return
+
         # Load mapping from file
         self._load_mapping()
+
+    def _load_baked_mapping(self) -> bool:
+        """Load the generated _archetype_data module. Returns True on success."""
+        try:
+            from . import _archetype_data
+        except ImportError:
+            return False
+
+        self.species_archetypes = dict(_archetype_data.SPECIES_ARCHETYPES)
+        self.archetype_descriptions = dict(_archetype_data.ARCHETYPE_DESCRIPTIONS)
+        self._archetype_index = None
+        return True
     
     def _load_mapping(self):
         """Load archetype mapping from file."""
@@ -39,14 +169,29 @@ class ArchetypeMapper:
                 self._create_default_mapping()
                 return
             
-            with open(mapping_path, 'r', encoding='utf-8') as f:
+            cache_key = str(mapping_path.resolve())
+            stat = os.stat(mapping_path)
+            cached = _MAPPING_CACHE.get(cache_key)
+
+            if cached and cached[0] == stat.st_mtime and cached[1] == stat.st_size:
+                _MAPPING_CACHE.move_to_end(cache_key)
+                data = cached[2]
+            else:
                 if mapping_path.suffix.lower() in ['.yaml', '.yml']:
-                    data = yaml.safe_load(f)
+                    data = self._load_yaml_with_cache(mapping_path)
                 else:
-                    data = json.load(f)
-            
-            self.species_archetypes = data.get('species_archetypes', {})
-            self.archetype_descriptions = data.get('archetype_descriptions', {})
+                    with open(mapping_path, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+
+                _MAPPING_CACHE[cache_key] = (stat.st_mtime, stat.st_size, data)
+                _MAPPING_CACHE.move_to_end(cache_key)
+                while len(_MAPPING_CACHE) > _MAPPING_CACHE_MAX:
+                    _MAPPING_CACHE.popitem(last=False)
+
+            # Deep-copy so add_species_mapping can't mutate the cache
+            self.species_archetypes = copy.deepcopy(data.get('species_archetypes', {}))
+            self.archetype_descriptions = copy.deepcopy(data.get('archetype_descriptions', {}))
+            self._archetype_index = None
             
             logger.info(f"Loaded {len(self.species_archetypes)} species mappings")
             
@@ -54,93 +199,53 @@ class ArchetypeMapper:
             logger.error(f"Failed to load mapping file: {e}")
             self._create_default_mapping()
     
+    def _load_yaml_with_cache(self, mapping_path: Path) -> dict:
+        """
+        Load a YAML mapping file, preferring a JSON sidecar cache.
+
+        YAML parsing dominates mapper construction time, so the parsed
+        dict is cached next to the source file as JSON (3-5x faster to
+        load) and validated against the YAML's mtime and size.
+        """
+        cache_path = mapping_path.with_suffix(mapping_path.suffix + '.cache.json')
+        stat = os.stat(mapping_path)
+
+        # Try the sidecar cache first
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if (cached.get('src_mtime') == stat.st_mtime
+                    and cached.get('src_size') == stat.st_size):
+                return cached['data']
+        except (OSError, ValueError, KeyError):
+            pass
+
+        # Cache miss or stale - parse the YAML and refresh the cache
+        with open(mapping_path, 'r', encoding='utf-8') as f:
+            data = yaml.load(f, Loader=_YamlLoader)
+
+        try:
+            fd, tmp_path = tempfile.mkstemp(
+                dir=str(mapping_path.parent), suffix='.tmp'
+            )
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'src_mtime': stat.st_mtime,
+                    'src_size': stat.st_size,
+                    'data': data,
+                }, f)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.debug(f"Could not write mapping cache {cache_path}: {e}")
+
+        return data
+
     def _create_default_mapping(self):
         """Create default archetype mapping."""
-        self.species_archetypes = {
-            # Cardinals and allies - Bold personalities
-            "Northern Cardinal": "bold gossip",
-            "Pyrrhuloxia": "desert sage",
-            
-            # Jays and crows - Intelligent troublemakers
-            "Blue Jay": "clever troublemaker",
-            "Steller's Jay": "mountain trickster",
-            "American Crow": "wise observer", 
-            "Common Grackle": "street-smart survivor",
-            
-            # Robins and thrushes - Friendly neighbors
-            "American Robin": "cheerful neighbor",
-            "Eastern Bluebird": "gentle optimist",
-            "Wood Thrush": "forest philosopher",
-            
-            # Sparrows - Humble workers
-            "House Sparrow": "busy worker",
-            "White-throated Sparrow": "quiet musician",
-            "Song Sparrow": "local storyteller",
-            
-            # Finches - Social butterflies
-            "American Goldfinch": "sunny socialite", 
-            "House Finch": "friendly chatterbox",
-            "Purple Finch": "sophisticated visitor",
-            
-            # Woodpeckers - Industrious builders
-            "Downy Woodpecker": "persistent craftsman",
-            "Red-bellied Woodpecker": "energetic builder",
-            "Pileated Woodpecker": "master carpenter",
-            
-            # Blackbirds - Dramatic performers
-            "Red-winged Blackbird": "territorial performer",
-            "European Starling": "versatile mimic",
-            "Brown-headed Cowbird": "mysterious wanderer",
-            
-            # Doves and pigeons - Peaceful mediators
-            "Mourning Dove": "gentle peacekeeper",
-            "Rock Pigeon": "urban survivor",
-            "Eurasian Collared-Dove": "polite newcomer",
-            
-            # Chickadees and nuthatches - Acrobatic entertainers
-            "Black-capped Chickadee": "acrobatic entertainer",
-            "White-breasted Nuthatch": "upside-down comedian",
-            "Tufted Titmouse": "curious explorer",
-            
-            # Warblers - Energetic travelers
-            "Yellow Warbler": "energetic traveler",
-            "American Redstart": "flashy dancer",
-            "Common Yellowthroat": "secretive spy",
-        }
-        
-        self.archetype_descriptions = {
-            "bold gossip": "Confident and social, always ready with the latest news from around the neighborhood.",
-            "desert sage": "Wise and adapted, sharing ancient knowledge of survival in harsh lands.",
-            "clever troublemaker": "Intelligent and mischievous, always finding creative solutions (and problems).",
-            "mountain trickster": "Playful and resourceful, using wit and cunning in high places.",
-            "wise observer": "Thoughtful and perceptive, watching the world with knowing eyes.",
-            "street-smart survivor": "Adaptable and tough, thriving in urban environments.",
-            "cheerful neighbor": "Friendly and reliable, the first to greet you in the morning.",
-            "gentle optimist": "Soft-spoken and hopeful, always seeing the bright side.",
-            "forest philosopher": "Contemplative and deep, pondering life's mysteries among the trees.",
-            "busy worker": "Industrious and practical, always building or gathering.",
-            "quiet musician": "Talented and modest, sharing beautiful songs when the mood strikes.",
-            "local storyteller": "Knowledgeable and engaging, full of tales about the area.",
-            "sunny socialite": "Bright and gregarious, bringing joy to every gathering.",
-            "friendly chatterbox": "Talkative and warm, never meeting a stranger.",
-            "sophisticated visitor": "Refined and cultured, gracing us with their presence.",
-            "persistent craftsman": "Skilled and determined, perfecting their art through repetition.",
-            "energetic builder": "Dynamic and creative, always working on the next project.",
-            "master carpenter": "Expert and powerful, creating impressive architectural works.",
-            "territorial performer": "Bold and dramatic, defending their stage with passion.",
-            "versatile mimic": "Talented and adaptable, learning new tricks constantly.",
-            "mysterious wanderer": "Enigmatic and unpredictable, following their own path.",
-            "gentle peacekeeper": "Calm and soothing, bringing tranquility to tense situations.",
-            "urban survivor": "Hardy and practical, making the best of city life.",
-            "polite newcomer": "Courteous and well-mannered, fitting in while maintaining their identity.",
-            "acrobatic entertainer": "Playful and athletic, delighting audiences with their antics.",
-            "upside-down comedian": "Quirky and amusing, finding humor in unique perspectives.",
-            "curious explorer": "Inquisitive and adventurous, always investigating something new.",
-            "energetic traveler": "Restless and vibrant, bringing stories from distant places.",
-            "flashy dancer": "Graceful and showy, expressing themselves through movement.",
-            "secretive spy": "Elusive and observant, gathering intelligence from the shadows."
-        }
-    
+        self.species_archetypes = dict(_DEFAULT_SPECIES_ARCHETYPES)
+        self.archetype_descriptions = dict(_DEFAULT_ARCHETYPE_DESCRIPTIONS)
+        self._archetype_index = None
+
     def get_archetype(self, species: str) -> Optional[str]:
         """
         Get archetype for a species.
@@ -179,10 +284,12 @@ class ArchetypeMapper:
         Returns:
             List of species names
         """
-        return [
-            species for species, arch in self.species_archetypes.items()
-            if arch == archetype
-        ]
+        if self._archetype_index is None:
+            index = {}
+            for species, arch in self.species_archetypes.items():
+                index.setdefault(arch, []).append(species)
+            self._archetype_index = index
+        return self._archetype_index.get(archetype, [])
     
     def add_species_mapping(self, species: str, archetype: str):
         """
@@ -193,6 +300,7 @@ class ArchetypeMapper:
             archetype: Archetype name
         """
         self.species_archetypes[species] = archetype
+        self._archetype_index = None
     
     def save_mapping(self, output_file: str = None):
         """
@@ -210,10 +318,17 @@ class ArchetypeMapper:
         }
         
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                if output_path.suffix.lower() in ['.yaml', '.yml']:
+            if output_path.suffix.lower() in ['.yaml', '.yml']:
+                with open(output_path, 'w', encoding='utf-8') as f:
                     yaml.safe_dump(data, f, default_flow_style=False, sort_keys=True)
-                else:
+            elif orjson is not None:
+                # orjson serializes straight to bytes ~10x faster than stdlib
+                with open(output_path, 'wb') as f:
+                    f.write(orjson.dumps(
+                        data, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS
+                    ))
+            else:
+                with open(output_path, 'w', encoding='utf-8') as f:
                     json.dump(data, f, indent=2, sort_keys=True)
             
             logger.info(f"Saved mapping to {output_path}")
@@ -222,5 +337,21 @@ class ArchetypeMapper:
             logger.error(f"Failed to save mapping: {e}")
 
 
-# Global archetype mapper instance
-archetype_mapper = ArchetypeMapper()
\ No newline at end of file
+class _LazyArchetypeMapper:
+    """Defers building the global ArchetypeMapper until first use.
+
+    Importing this module no longer touches the filesystem; processes
+    that never look up an archetype (migration scripts, most tests) pay
+    nothing.
+    """
+
+    _mapper = None
+
+    def __getattr__(self, name):
+        if _LazyArchetypeMapper._mapper is None:
+            _LazyArchetypeMapper._mapper = ArchetypeMapper()
+        return getattr(_LazyArchetypeMapper._mapper, name)
+
+
+# Global archetype mapper instance (materialized on first attribute access)
+archetype_mapper = _LazyArchetypeMapper()
\ No newline at end of file
@@ -4,17 +4,55 @@ Character management system.
 Handles character placeholder creation, updates, and lifecycle management.
 """
 import logging
+import sys
+import time
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import List, Optional, Dict, Any
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, inspect, or_
+from sqlalchemy.sql import ClauseElement
 
-from .models import Character, RecognitionEventDB, CharacterResponse, CharacterUpdate
+try:
+    import ciso8601
+except ImportError:  # Optional C parser; stdlib fromisoformat otherwise
+    ciso8601 = None
+
+from .models import Character, RecognitionEventDB, CharacterResponse, CharacterUpdate, pack_bbox
 from .archetype_mapper import archetype_mapper
 from .database import get_db
 
 logger = logging.getLogger(__name__)
 
+# Deletes everything except alphanumerics and whitespace; faster than a
+# regex pass in the per-detection _generate_character_id path
+_KEEP_ALNUM_WS = str.maketrans({
+    c: None for c in map(chr, range(128))
+    if not (c.isalnum() or c.isspace())
+})
+
+# fromisoformat accepts a trailing 'Z' natively from Python 3.11
+_NATIVE_Z = sys.version_info >= (3, 11)
+
+# TTL cache for the dashboard species-count aggregation; invalidated
+# whenever an event creates characters
+_SPECIES_COUNT_TTL = 30.0
+_species_count_cache = {'expires': 0.0, 'value': None}
+
+
+def _clear_species_count_cache():
+    _species_count_cache['expires'] = 0.0
+    _species_count_cache['value'] = None
+
+
+def _parse_timestamp(timestamp_str: str) -> datetime:
+    """Parse an ISO-8601 event timestamp, tolerating a 'Z' suffix."""
+    if ciso8601 is not None:
+        return ciso8601.parse_datetime(timestamp_str)
+    if _NATIVE_Z:
+        return datetime.fromisoformat(timestamp_str)
+    return datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
+
 
 class CharacterManager:
     """Manages character creation and lifecycle."""
@@ -23,77 +61,147 @@ class CharacterManager:
         self.archetype_mapper = archetype_mapper
     
     def create_characters_from_event(
-        self, 
+        self,
         db: Session,
-        event_data: Dict[str, Any]
+        event_data: Dict[str, Any],
+        commit: bool = True
     ) -> List[Character]:
         """
         Create character placeholders from a recognition event.
-        
+
         Args:
             db: Database session
             event_data: Recognition event data
-            
+            commit: Commit after processing. The batch ingest path passes
+                False and commits once per batch so many events share a
+                single fsync.
+
         Returns:
             List of created Character objects
         """
         created_characters = []
-        
+
         # Extract event information
         detections = event_data.get('detections', [])
         timestamp_str = event_data.get('timestamp')
-        timestamp = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-        
-        # Store the recognition event
+        timestamp = _parse_timestamp(timestamp_str)
+
+        # Phase 1: parse detections into parallel lists so the later
+        # phases run tight loops over plain locals
+        species_arr = []
+        count_arr = []
+        conf_arr = []
+        lowconf_arr = []
+        bbox_arr = []
         for detection in detections:
-            species = detection['species']
-            count = detection.get('count', 1)
-            confidence = detection.get('confidence', 0.0)
-            low_confidence = detection.get('low_confidence', False)
-            bbox = detection.get('bbox')
-            
-            # Store recognition event in database
-            event_record = RecognitionEventDB(
-                timestamp=timestamp,
-                source=event_data['source'],
-                species=species,
-                count=count,
-                confidence=confidence,
-                low_confidence=low_confidence,
-                bbox=bbox,
-                snapshot_url=event_data.get('snapshot_url')
-            )
-            db.add(event_record)
-            
+            species_arr.append(detection['species'])
+            count_arr.append(detection.get('count', 1))
+            conf_arr.append(detection.get('confidence', 0.0))
+            lowconf_arr.append(detection.get('low_confidence', False))
+            bbox_arr.append(detection.get('bbox'))
+
+        # Phase 2: prefetch every character the detections can touch in
+        # two queries instead of one SELECT per detection.
+        wanted_ids = set()
+        single_species = set()
+        for species, count in zip(species_arr, count_arr):
+            if count > 1:
+                for i in range(1, count + 1):
+                    wanted_ids.add(self._generate_character_id(species, i))
+            elif count == 1:
+                single_species.add(species)
+
+        existing_by_id = {}
+        if wanted_ids:
+            existing_by_id = {
+                c.id: c
+                for c in db.query(Character).filter(Character.id.in_(wanted_ids))
+            }
+
+        latest_by_species = {}
+        if single_species:
+            # Rows arrive most-recent-last per species, so the dict ends
+            # up holding the most recently seen character of each
+            for c in (
+                db.query(Character)
+                .filter(Character.species.in_(single_species))
+                .order_by(Character.species, Character.last_seen.asc())
+            ):
+                latest_by_species[c.species] = c
+
+        # Phase 3: build plain event-row dicts and apply character
+        # logic; the rows are bulk-inserted in one statement below
+        # instead of one ORM INSERT per detection.
+        source = event_data['source']
+        snapshot_url = event_data.get('snapshot_url')
+        event_rows = []
+        # Duplicate (species, count) detections are common with
+        # audio+image fusion; resolve the character set once per key and
+        # only record the extra appearances for repeats
+        seen_multi = {}
+        for species, count, confidence, low_confidence, bbox in zip(
+            species_arr, count_arr, conf_arr, lowconf_arr, bbox_arr
+        ):
+            event_row = {
+                'timestamp': timestamp,
+                'source': source,
+                'species': species,
+                'count': count,
+                'confidence': confidence,
+                'low_confidence': low_confidence,
+                'bbox_blob': pack_bbox(bbox),
+                'snapshot_url': snapshot_url,
+                'character_id': None,
+            }
+            event_rows.append(event_row)
+
             # Create character placeholders for multi-count detections
             if count > 1:
-                characters = self._create_character_instances(
-                    db=db,
-                    species=species,
-                    count=count,
-                    timestamp=timestamp,
-                    event_record=event_record
-                )
-                created_characters.extend(characters)
-            
+                key = (species, count)
+                characters = seen_multi.get(key)
+                if characters is None:
+                    characters = self._create_character_instances(
+                        db=db,
+                        species=species,
+                        count=count,
+                        timestamp=timestamp,
+                        existing_by_id=existing_by_id
+                    )
+                    seen_multi[key] = characters
+                    created_characters.extend(characters)
+                else:
+                    for character in characters:
+                        _record_appearance(character, timestamp)
+                if characters:
+                    event_row['character_id'] = characters[-1].id
+
             # For single count, still update existing character if it exists
             elif count == 1:
                 character = self._update_or_create_single_character(
                     db=db,
                     species=species,
                     timestamp=timestamp,
-                    event_record=event_record
+                    latest_by_species=latest_by_species
                 )
                 if character:
                     created_characters.append(character)
-        
+                    event_row['character_id'] = character.id
+
         # Commit all changes
         try:
-            db.commit()
-            logger.info(f"Created {len(created_characters)} character records")
+            # Flush new characters first so event FKs resolve, then
+            # insert all event rows in a single multi-row statement
+            db.flush()
+            if event_rows:
+                db.bulk_insert_mappings(RecognitionEventDB, event_rows)
+            if commit:
+                db.commit()
+            if created_characters:
+                _clear_species_count_cache()
+            logger.info("Created %d character records", len(created_characters))
         except Exception as e:
             db.rollback()
-            logger.error(f"Failed to create characters: {e}")
+            logger.error("Failed to create characters: %s", e)
             raise
         
         return created_characters
@@ -104,31 +212,33 @@ class CharacterManager:
         species: str,
         count: int,
         timestamp: datetime,
-        event_record: RecognitionEventDB
+        existing_by_id: Dict[str, Character]
     ) -> List[Character]:
-        """Create multiple character instances for a species."""
+        """Create multiple character instances for a species.
+
+        Args:
+            existing_by_id: Prefetched characters keyed by ID; newly
+                created characters are added so later detections in the
+                same event see them.
+        """
         characters = []
-        
+
         for i in range(1, count + 1):
             character_id = self._generate_character_id(species, i)
-            
+
             # Check if character already exists
-            existing = db.query(Character).filter(Character.id == character_id).first()
-            
+            existing = existing_by_id.get(character_id)
+
             if existing:
                 # Update existing character
-                existing.last_seen = timestamp
-                existing.appearance_count += 1
+                _record_appearance(existing, timestamp)
                 characters.append(existing)
-                
-                # Link event to character
-                event_record.character_id = character_id
-                
-                logger.debug(f"Updated existing character: {character_id}")
+
+                logger.debug("Updated existing character: %s", character_id)
             else:
                 # Create new character
                 archetype = self.archetype_mapper.get_archetype(species)
-                
+
                 character = Character(
                     id=character_id,
                     species=species,
@@ -137,15 +247,13 @@ class CharacterManager:
                     last_seen=timestamp,
                     appearance_count=1
                 )
-                
+
                 db.add(character)
                 characters.append(character)
-                
-                # Link event to character
-                event_record.character_id = character_id
-                
-                logger.debug(f"Created new character: {character_id}")
-        
+                existing_by_id[character_id] = character
+
+                logger.debug("Created new character: %s", character_id)
+
         return characters
     
     def _update_or_create_single_character(
@@ -153,26 +261,24 @@ class CharacterManager:
         db: Session,
         species: str,
         timestamp: datetime,
-        event_record: RecognitionEventDB
+        latest_by_species: Dict[str, Character]
     ) -> Optional[Character]:
-        """Update or create a single character for a species."""
+        """Update or create a single character for a species.
+
+        Args:
+            latest_by_species: Prefetched most-recent character per
+                species; updated in place as characters are created.
+        """
         # For single counts, we can either:
         # 1. Update an existing character of this species
         # 2. Create a new character if none exist
-        
-        # Find the most recent character of this species
-        existing = (
-            db.query(Character)
-            .filter(Character.species == species)
-            .order_by(Character.last_seen.desc())
-            .first()
-        )
-        
+
+        # Most recent character of this species, prefetched by the caller
+        existing = latest_by_species.get(species)
+
         if existing:
             # Update existing character
-            existing.last_seen = timestamp
-            existing.appearance_count += 1
-            event_record.character_id = existing.id
+            _record_appearance(existing, timestamp)
             return existing
         else:
             # Create new character with index 1
@@ -189,54 +295,76 @@ class CharacterManager:
             )
             
             db.add(character)
-            event_record.character_id = character_id
-            
-            logger.debug(f"Created new single character: {character_id}")
+            latest_by_species[species] = character
+
+            logger.debug("Created new single character: %s", character_id)
             return character
     
     def _generate_character_id(self, species: str, index: int) -> str:
         """Generate character ID from species name and index."""
-        import re
-        
-        # Convert to lowercase, replace spaces with underscores, remove special chars
-        clean_name = re.sub(r'[^a-zA-Z0-9\s]', '', species.lower())
-        clean_name = re.sub(r'\s+', '_', clean_name.strip())
-        return f"{clean_name}_{index}"
+        return _generate_character_id(species, index)
     
     def get_character_by_id(self, db: Session, character_id: str) -> Optional[Character]:
         """Get character by ID."""
         return db.query(Character).filter(Character.id == character_id).first()
     
     def get_characters(
-        self, 
+        self,
         db: Session,
-        skip: int = 0,
+        cursor: Optional[tuple] = None,
         limit: int = 100,
         species_filter: Optional[str] = None,
         archetype_filter: Optional[str] = None
-    ) -> List[Character]:
+    ) -> tuple:
         """
-        Get list of characters with optional filtering.
-        
+        Get a page of characters with optional filtering.
+
+        Uses keyset pagination on (last_seen, id) instead of OFFSET, so
+        deep pages stay index seeks rather than scan-and-discard.
+
         Args:
             db: Database session
-            skip: Number of records to skip
+            cursor: (last_seen, id) of the last row on the previous
+                page, or None for the first page
             limit: Maximum number of records to return
             species_filter: Filter by species
             archetype_filter: Filter by archetype
-            
+
         Returns:
-            List of Character objects
+            Tuple of (characters, next_cursor); next_cursor is None when
+            there are no further pages.
         """
         query = db.query(Character)
-        
+
         if species_filter:
             query = query.filter(Character.species.ilike(f"%{species_filter}%"))
-        
+
         if archetype_filter:
             query = query.filter(Character.archetype == archetype_filter)
-        
-        return query.order_by(Character.last_seen.desc()).offset(skip).limit(limit).all()
+
+        if cursor is not None:
+            last_seen, last_id = cursor
+            query = query.filter(
+                or_(
+                    Character.last_seen < last_seen,
+                    and_(
+                        Character.last_seen == last_seen,
+                        Character.id < last_id
+                    )
+                )
+            )
+
+        rows = (
+            query
+            .order_by(Character.last_seen.desc(), Character.id.desc())
+            .limit(limit)
+            .all()
+        )
+
+        next_cursor = None
+        if len(rows) == limit:
+            next_cursor = (rows[-1].last_seen, rows[-1].id)
+        return rows, next_cursor
     
     def update_character(
         self, 
@@ -261,18 +389,18 @@ class CharacterManager:
             return None
         
         # Apply updates
-        update_data = updates.dict(exclude_unset=True)
+        update_data = updates.model_dump(exclude_unset=True)
         
         for field, value in update_data.items():
             setattr(character, field, value)
         
         try:
             db.commit()
-            logger.info(f"Updated character {character_id}")
+            logger.info("Updated character %s", character_id)
             return character
         except Exception as e:
             db.rollback()
-            logger.error(f"Failed to update character {character_id}: {e}")
+            logger.error("Failed to update character %s: %s", character_id, e)
             raise
     
     def get_active_characters_in_timeframe(
@@ -312,14 +440,54 @@ class CharacterManager:
             Dictionary mapping species to character count
         """
         from sqlalchemy import func
-        
+
+        if (_species_count_cache['value'] is not None
+                and time.monotonic() < _species_count_cache['expires']):
+            return dict(_species_count_cache['value'])
+
         results = (
             db.query(Character.species, func.count(Character.id))
             .group_by(Character.species)
             .all()
         )
-        
-        return {species: count for species, count in results}
+
+        counts = {species: count for species, count in results}
+        _species_count_cache['value'] = counts
+        _species_count_cache['expires'] = time.monotonic() + _SPECIES_COUNT_TTL
+        return dict(counts)
+
+
+def _record_appearance(character: Character, timestamp: datetime):
+    """Bump a character's appearance count and last_seen.
+
+    Persistent rows get a server-side ``appearance_count + 1`` expression
+    so concurrent events cannot lose increments; rows still pending in
+    this session are incremented in Python (nothing else can see them
+    yet, and an SQL expression cannot be INSERTed).
+    """
+    character.last_seen = timestamp
+    if inspect(character).persistent:
+        current = character.appearance_count
+        if isinstance(current, ClauseElement):
+            # Already carries an unflushed increment from this event
+            character.appearance_count = current + 1
+        else:
+            character.appearance_count = Character.appearance_count + 1
+    else:
+        character.appearance_count += 1
+
+
+@lru_cache(maxsize=1024)
+def _generate_character_id(species: str, index: int) -> str:
+    """Generate a character ID like "northern_cardinal_1" from a species name.
+
+    Species names form a small, highly repetitive set, so the result is
+    memoized and repeat calls cost a dict lookup.
+    """
+    # Lowercase, drop special chars, collapse whitespace to underscores
+    clean_name = species.lower().translate(_KEEP_ALNUM_WS)
+    clean_name = '_'.join(clean_name.split())
+    return f"{clean_name}_{index}"
 
 
 # Global character manager instance
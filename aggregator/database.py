@@ -2,13 +2,29 @@
 Database configuration and session management.
 """
 import os
-from sqlalchemy import create_engine, MetaData
+from sqlalchemy import create_engine, event, MetaData
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 from pydantic import ConfigDict
 from pydantic_settings import BaseSettings
 
+try:
+    import orjson
+except ImportError:  # Optional; JSON columns fall back to stdlib json
+    orjson = None
+
+if orjson is not None:
+    # orjson (de)serializes the JSON columns in C, several times faster
+    # than the stdlib default on the big event payloads
+    _json_engine_kwargs = {
+        "json_serializer": lambda obj: orjson.dumps(obj).decode(),
+        "json_deserializer": orjson.loads,
+    }
+else:
+    _json_engine_kwargs = {}
+
 class DatabaseSettings(BaseSettings):
     """Database configuration settings."""
     
@@ -27,29 +43,94 @@ db_settings = DatabaseSettings()
 
 # Create engine
 if db_settings.database_url.startswith("sqlite"):
-    # SQLite configuration with thread safety
+    # SQLite configuration with thread safety. File-backed databases use
+    # the default QueuePool so WAL readers can run in parallel across
+    # threads; in-memory databases must share one connection.
+    if ":memory:" in db_settings.database_url or db_settings.database_url in ("sqlite://", "sqlite:///"):
+        sqlite_pool_kwargs = {"poolclass": StaticPool}
+    else:
+        sqlite_pool_kwargs = {"pool_pre_ping": True}
+
     engine = create_engine(
         db_settings.database_url,
         echo=db_settings.echo,
-        poolclass=StaticPool,
         connect_args={
             "check_same_thread": False,
         },
+        **sqlite_pool_kwargs,
+        **_json_engine_kwargs,
     )
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        # WAL + synchronous=NORMAL keep commits durable enough for event
+        # ingest while avoiding an fsync per transaction
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.close()
 else:
-    # PostgreSQL configuration
+    # PostgreSQL configuration with a sized, health-checked pool so
+    # concurrent requests reuse connections instead of re-handshaking
     engine = create_engine(
         db_settings.database_url,
         echo=db_settings.echo,
+        pool_size=20,
+        max_overflow=10,
+        pool_timeout=30,
+        pool_pre_ping=True,
+        pool_recycle=1800,
+        **_json_engine_kwargs,
     )
 
 # Create session factory
 SessionLocal = sessionmaker(
-    autocommit=False, 
-    autoflush=False, 
+    autocommit=False,
+    autoflush=False,
     bind=engine
 )
 
+
+def _async_database_url(url: str) -> str:
+    """Map the sync database URL onto its async driver equivalent."""
+    if url.startswith("sqlite+") or url.startswith("postgresql+"):
+        return url
+    if url.startswith("sqlite"):
+        return url.replace("sqlite", "sqlite+aiosqlite", 1)
+    if url.startswith("postgresql"):
+        return url.replace("postgresql", "postgresql+asyncpg", 1)
+    return url
+
+
+# Async engine for the FastAPI request path; DB I/O awaits instead of
+# parking the event loop thread
+if db_settings.database_url.startswith("sqlite"):
+    async_engine = create_async_engine(
+        _async_database_url(db_settings.database_url),
+        echo=db_settings.echo,
+        **_json_engine_kwargs,
+    )
+    event.listens_for(async_engine.sync_engine, "connect")(_set_sqlite_pragmas)
+else:
+    async_engine = create_async_engine(
+        _async_database_url(db_settings.database_url),
+        echo=db_settings.echo,
+        pool_size=20,
+        max_overflow=10,
+        pool_timeout=30,
+        pool_pre_ping=True,
+        pool_recycle=1800,
+        **_json_engine_kwargs,
+    )
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 # Create declarative base
 Base = declarative_base()
 
@@ -66,6 +147,12 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    """Get async database session dependency."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def create_tables():
     """Create all database tables."""
     Base.metadata.create_all(bind=engine)
\ No newline at end of file
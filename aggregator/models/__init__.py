@@ -1,22 +1,52 @@
 """
 Database models for character management and event storage.
 """
+import struct
 from datetime import datetime
 from typing import Optional, List
-from sqlalchemy import Column, Integer, String, DateTime, Text, Float, Boolean, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, DateTime, Text, Float, Boolean, ForeignKey, Index, JSON, LargeBinary, text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from enum import Enum
 
 from ..database import Base
 
 
+def pack_bbox(bbox) -> Optional[bytes]:
+    """Pack a bounding box into 16 little-endian float32 bytes.
+
+    Accepts the {"x", "y", "width", "height"} dict produced by the
+    recognizers or a plain [x, y, w, h] sequence; returns None for None.
+    """
+    if bbox is None:
+        return None
+    if isinstance(bbox, dict):
+        values = (bbox['x'], bbox['y'], bbox['width'], bbox['height'])
+    else:
+        values = tuple(bbox[:4])
+    return struct.pack('<4f', *values)
+
+
+def unpack_bbox(blob: Optional[bytes]) -> Optional[dict]:
+    """Unpack a 16-byte bbox blob back into the API dict form."""
+    if blob is None:
+        return None
+    x, y, width, height = struct.unpack('<4f', blob)
+    return {'x': x, 'y': y, 'width': width, 'height': height}
+
+
 class Character(Base):
     """Character model for storing bird character instances."""
     
     __tablename__ = "characters"
-    
+    __table_args__ = (
+        # Most-recent-character-per-species lookup and last_seen pagination
+        Index("ix_char_species_lastseen", "species", "last_seen"),
+        Index("ix_char_lastseen", "last_seen"),
+    )
+
     id = Column(String, primary_key=True)  # e.g., "northern_cardinal_1"
     species = Column(String, nullable=False)  # e.g., "Northern Cardinal"
     archetype = Column(String, nullable=True)  # e.g., "bold gossip"
@@ -36,7 +66,13 @@ class RecognitionEventDB(Base):
     """Database model for storing recognition events."""
     
     __tablename__ = "recognition_events"
-    
+    __table_args__ = (
+        # Time-window scans filtered/grouped by species; descending
+        # timestamp matches the ORDER BY timestamp DESC read path so the
+        # planner walks the index without a sort
+        Index("ix_recev_ts_species", text("timestamp DESC"), "species"),
+    )
+
     id = Column(Integer, primary_key=True, autoincrement=True)
     timestamp = Column(DateTime, nullable=False)
     source = Column(String, nullable=False)  # "audio" or "image"
@@ -44,13 +80,24 @@ class RecognitionEventDB(Base):
     count = Column(Integer, nullable=False)
     confidence = Column(Float, nullable=False)
     low_confidence = Column(Boolean, default=False)
-    bbox = Column(JSON, nullable=True)  # Bounding box for images
+    # Bounding box stored as 4 packed float32s; JSON codec overhead on
+    # every event write/read was measurable, raw bytes are free
+    bbox_blob = Column(LargeBinary(16), nullable=True)
     snapshot_url = Column(String, nullable=True)
     character_id = Column(String, ForeignKey("characters.id"), nullable=True)
-    
+
     # Relationships
     character = relationship("Character", back_populates="events")
-    
+
+    @property
+    def bbox(self) -> Optional[dict]:
+        """Bounding box in the JSON-compatible dict form used by the API."""
+        return unpack_bbox(self.bbox_blob)
+
+    @bbox.setter
+    def bbox(self, value):
+        self.bbox_blob = pack_bbox(value)
+
     def __repr__(self):
         return f"<RecognitionEvent(species='{self.species}', count={self.count}, timestamp='{self.timestamp}')>"
 
@@ -63,8 +110,10 @@ class AggregationSummary(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     start_time = Column(DateTime, nullable=False)
     end_time = Column(DateTime, nullable=False)
-    species_counts = Column(JSON, nullable=False)  # {"Northern Cardinal": 3, "Blue Jay": 1}
-    active_characters = Column(JSON, nullable=False)  # [{"id": "cardinal_1", "species": "Northern Cardinal"}]
+    # JSONB on PostgreSQL (binary storage, no re-parse on read); plain
+    # JSON elsewhere
+    species_counts = Column(JSON().with_variant(JSONB, "postgresql"), nullable=False)  # {"Northern Cardinal": 3, "Blue Jay": 1}
+    active_characters = Column(JSON().with_variant(JSONB, "postgresql"), nullable=False)  # [{"id": "cardinal_1", "species": "Northern Cardinal"}]
     dominant_snapshot = Column(String, nullable=True)  # URL to most confident detection
     total_detections = Column(Integer, default=0)
     average_confidence = Column(Float, default=0.0)
@@ -85,8 +134,7 @@ class CharacterResponse(BaseModel):
     appearance_count: int
     notes: Optional[str] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class CharacterUpdate(BaseModel):
@@ -110,8 +158,7 @@ class RecognitionEventResponse(BaseModel):
     snapshot_url: Optional[str] = None
     character_id: Optional[str] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class AggregationSummaryResponse(BaseModel):
@@ -126,8 +173,7 @@ class AggregationSummaryResponse(BaseModel):
     total_detections: int
     average_confidence: float
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class StoryInput(BaseModel):
@@ -6,17 +6,32 @@ and provides sliding window aggregation for story generation.
 """
 import asyncio
 import logging
+import time
 from datetime import datetime, timezone, timedelta
-from typing import List, Dict, Any, Optional
-from collections import defaultdict, deque
+from typing import List, Dict, Any, NamedTuple, Optional
+from collections import Counter, deque
 
-from fastapi import FastAPI, HTTPException, Depends, Query
+from fastapi import FastAPI, HTTPException, Depends, Query, Response
 from fastapi.responses import JSONResponse
+
+try:
+    # orjson serializes responses in C; fall back to stdlib json without it
+    import orjson  # noqa: F401 — required by ORJSONResponse at runtime
+    from fastapi.responses import ORJSONResponse as _DefaultResponseClass
+except ImportError:
+    _DefaultResponseClass = JSONResponse
 from pydantic import BaseModel
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from .database import get_db, engine, SessionLocal
-from .character_manager import character_manager
+try:
+    import numpy as np
+except ImportError:  # Optional; the buffer falls back to a plain deque
+    np = None
+
+from .database import get_async_db, engine, AsyncSessionLocal
+from .character_manager import character_manager, _parse_timestamp
 from .models import Character, RecognitionEventDB, AggregationSummary
 from shared.database.models import RecognitionEvent, Snapshot
 
@@ -32,12 +47,98 @@ class StoryInput(BaseModel):
     location: str = "Cornell Lab feeder"
 
 
+class BufferedEvent(NamedTuple):
+    """Compact per-detection record for the in-memory event buffer.
+
+    Strings are interned to small ints via the service's registry and the
+    timestamp is kept as an epoch float, so a buffered record is a flat
+    tuple of numbers instead of a nested event dict.
+    """
+    ts_epoch: float
+    source_id: int
+    species_id: int
+    count: int
+    confidence: float
+
+
+class _EventRing:
+    """Preallocated structure-of-arrays ring buffer for BufferedEvents.
+
+    Each field lives in its own NumPy array, so aggregating the buffer is
+    a handful of vectorized whole-array operations instead of a Python
+    loop over record objects.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        self.capacity = capacity
+        self._ts = np.empty(capacity, dtype='f8')
+        self._source_id = np.empty(capacity, dtype='i4')
+        self._species_id = np.empty(capacity, dtype='i4')
+        self._count = np.empty(capacity, dtype='i4')
+        self._conf = np.empty(capacity, dtype='f4')
+        self._head = 0  # Next write slot
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def append(self, record: BufferedEvent):
+        i = self._head
+        self._ts[i] = record.ts_epoch
+        self._source_id[i] = record.source_id
+        self._species_id[i] = record.species_id
+        self._count[i] = record.count
+        self._conf[i] = record.confidence
+        self._head = (i + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+
+    def species_activity(self, since_epoch: float, n_species: int):
+        """Vectorized per-species totals for records newer than since_epoch.
+
+        Returns (detections, total_count, sum_confidence) arrays indexed
+        by species id. Aggregation is order-independent, so a full ring
+        is consumed as-is without unrolling head/tail.
+        """
+        live = slice(0, self._size) if self._size < self.capacity else slice(None)
+        mask = self._ts[live] >= since_epoch
+        ids = self._species_id[live][mask]
+        detections = np.bincount(ids, minlength=n_species)
+        total_count = np.bincount(
+            ids, weights=self._count[live][mask], minlength=n_species
+        )
+        sum_conf = np.bincount(
+            ids, weights=self._conf[live][mask], minlength=n_species
+        )
+        return detections, total_count, sum_conf
+
+
+def _event_id_floor(since: datetime):
+    """Scalar subquery for the smallest event id at or after ``since``.
+
+    Event ids are monotonic with insertion order, so pairing the
+    timestamp filter with ``id >= (floor)`` gives the planner a primary
+    key range to drive the scan from — cheaper than a secondary-index
+    walk plus heap fetches once the table is large.
+    """
+    return (
+        select(func.min(RecognitionEventDB.id))
+        .where(RecognitionEventDB.timestamp >= since)
+        .scalar_subquery()
+    )
+
+
 class AggregationConfig:
     """Configuration for aggregation windows."""
     WINDOW_SIZE_MINUTES = 15  # Sliding window size
     CLEANUP_INTERVAL_HOURS = 24  # How often to clean old events
     MAX_CHARACTERS_PER_STORY = 5  # Limit characters in story
     MIN_CONFIDENCE_THRESHOLD = 0.7  # Skip low confidence detections
+    INGEST_BATCH_SIZE = 50  # Max events committed per transaction
+    INGEST_BATCH_WAIT_MS = 100  # Max time to wait filling a batch
+    SUMMARY_CACHE_TTL_SECONDS = 5  # How long /summary responses stay fresh
+    SUMMARY_CACHE_MAX_ENTRIES = 64  # Cap on cached (bucket, window) keys
+    CLEANUP_BATCH_SIZE = 10000  # Rows deleted per cleanup transaction
 
 
 class AggregatorService:
@@ -45,23 +146,246 @@ class AggregatorService:
     
     def __init__(self):
         self.config = AggregationConfig()
-        self.event_buffer = deque(maxlen=1000)  # In-memory event buffer
+        # BufferedEvent records; a NumPy SoA ring when available, else a
+        # plain deque of the same tuples
+        if np is not None:
+            self.event_buffer = _EventRing(1000)
+        else:
+            self.event_buffer = deque(maxlen=1000)
         self.running = False
-    
+        # String interning registry for BufferedEvent; species/source
+        # names repeat constantly, so each is stored once
+        self._string_ids: Dict[str, int] = {}
+        self._strings: List[str] = []
+        # Incremental sliding-window stats: every detection is added on
+        # ingest and subtracted on eviction, so the window summary is
+        # O(species) to read instead of rescanning events
+        self._window_entries = deque()  # (timestamp, species, source, count, confidence)
+        self._window_stats: Dict[str, Dict[str, Any]] = {}
+        # Ingest queue drained by a background consumer that commits
+        # events in batches; created once an event loop is running
+        self._event_queue: Optional[asyncio.Queue] = None
+        self._consumer_task: Optional[asyncio.Task] = None
+        # TTL cache of /summary responses keyed by (since bucket, window
+        # size); dashboard polling repeats identical queries far faster
+        # than the inputs change. Cleared on every ingested event.
+        self._summary_cache: Dict[tuple, tuple] = {}
+
+    def _window_add(self, timestamp: datetime, source: str, detections: List[Dict[str, Any]]):
+        """Fold an event's detections into the sliding-window stats."""
+        for detection in detections:
+            species = detection['species']
+            count = detection.get('count', 1)
+            confidence = detection.get('confidence', 0.0)
+
+            self._window_entries.append(
+                (timestamp, species, source, count, confidence)
+            )
+
+            stats = self._window_stats.get(species)
+            if stats is None:
+                stats = self._window_stats[species] = {
+                    'total_detections': 0,
+                    'total_count': 0,
+                    'sum_confidence': 0.0,
+                    'sources': Counter(),
+                    'last_seen': None,
+                }
+            stats['total_detections'] += 1
+            stats['total_count'] += count
+            stats['sum_confidence'] += confidence
+            stats['sources'][source] += 1
+            if stats['last_seen'] is None or timestamp > stats['last_seen']:
+                stats['last_seen'] = timestamp
+
+    def _evict_expired(self, now: datetime):
+        """Subtract entries that fell out of the sliding window."""
+        cutoff = now - timedelta(minutes=self.config.WINDOW_SIZE_MINUTES)
+        entries = self._window_entries
+        while entries and entries[0][0] < cutoff:
+            timestamp, species, source, count, confidence = entries.popleft()
+            stats = self._window_stats.get(species)
+            if stats is None:
+                continue
+            stats['total_detections'] -= 1
+            stats['total_count'] -= count
+            stats['sum_confidence'] -= confidence
+            stats['sources'][source] -= 1
+            if stats['sources'][source] <= 0:
+                del stats['sources'][source]
+            if stats['total_detections'] <= 0:
+                # last_seen is not invertible; dropping the empty entry
+                # keeps the snapshot honest once a species fully expires
+                del self._window_stats[species]
+
+    def _window_snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Render the running stats in the summary's species format."""
+        snapshot = {}
+        for species, stats in self._window_stats.items():
+            n = stats['total_detections']
+            snapshot[species] = {
+                'total_detections': n,
+                'total_count': stats['total_count'],
+                'avg_confidence': stats['sum_confidence'] / n if n else 0.0,
+                'sources': list(stats['sources']),
+                'last_seen': (
+                    stats['last_seen'].isoformat()
+                    if stats['last_seen'] else None
+                ),
+            }
+        return snapshot
+
+    def buffer_species_activity(self, since: datetime) -> Dict[str, Dict[str, Any]]:
+        """Aggregate the in-memory buffer per species since a timestamp.
+
+        With the NumPy ring this is a few vectorized bincounts; the deque
+        fallback scans the tuples in Python.
+        """
+        since_epoch = since.timestamp()
+        result: Dict[str, Dict[str, Any]] = {}
+
+        if isinstance(self.event_buffer, deque):
+            for record in self.event_buffer:
+                if record.ts_epoch < since_epoch:
+                    continue
+                species = self._strings[record.species_id]
+                stats = result.setdefault(species, {
+                    'total_detections': 0,
+                    'total_count': 0,
+                    'avg_confidence': 0.0,
+                })
+                stats['total_detections'] += 1
+                stats['total_count'] += record.count
+                stats['avg_confidence'] += record.confidence
+            for stats in result.values():
+                stats['avg_confidence'] /= stats['total_detections']
+            return result
+
+        detections, total_count, sum_conf = self.event_buffer.species_activity(
+            since_epoch, len(self._strings)
+        )
+        for species_id in np.nonzero(detections)[0]:
+            n = int(detections[species_id])
+            result[self._strings[species_id]] = {
+                'total_detections': n,
+                'total_count': int(total_count[species_id]),
+                'avg_confidence': float(sum_conf[species_id]) / n,
+            }
+        return result
+
     def start_background_processing(self):
         """Start background event processing."""
         self.running = True
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if loop is not None:
+            self._event_queue = asyncio.Queue()
+            self._consumer_task = loop.create_task(self._consume_events())
         logger.info("Aggregator service started")
-    
+
     def stop_background_processing(self):
         """Stop background event processing."""
         self.running = False
+        if self._consumer_task is not None:
+            self._consumer_task.cancel()
+            self._consumer_task = None
+        self._event_queue = None
         logger.info("Aggregator service stopped")
-    
+
+    def _intern_string(self, value: str) -> int:
+        """Map a species/source name onto its small stable int id."""
+        string_id = self._string_ids.get(value)
+        if string_id is None:
+            string_id = self._string_ids[value] = len(self._strings)
+            self._strings.append(value)
+        return string_id
+
+    def _ingest_event_stats(self, event_data: Dict[str, Any]):
+        """Fold an incoming event into the buffer and window stats."""
+        now = datetime.now(timezone.utc)
+        event_data['processed_at'] = now.isoformat()
+
+        timestamp = _parse_timestamp(event_data['timestamp'])
+        detections = event_data.get('detections', [])
+
+        # Buffer compact per-detection tuples, not the full event dicts
+        ts_epoch = timestamp.timestamp()
+        source_id = self._intern_string(event_data['source'])
+        for detection in detections:
+            self.event_buffer.append(BufferedEvent(
+                ts_epoch,
+                source_id,
+                self._intern_string(detection['species']),
+                detection.get('count', 1),
+                detection.get('confidence', 0.0),
+            ))
+
+        self._window_add(timestamp, event_data['source'], detections)
+        self._evict_expired(now)
+
+        # New data invalidates any cached summaries
+        self._summary_cache.clear()
+
+    def enqueue_recognition_event(self, event_data: Dict[str, Any]) -> bool:
+        """Queue an event for batched background persistence.
+
+        Window stats are updated immediately so /summary stays current;
+        the database write happens in the consumer's next batch commit.
+        Returns False when the consumer is not running and the caller
+        should fall back to inline processing.
+        """
+        if self._event_queue is None:
+            return False
+        self._ingest_event_stats(event_data)
+        self._event_queue.put_nowait(event_data)
+        return True
+
+    async def _consume_events(self):
+        """Drain the ingest queue, committing events in batches.
+
+        Waits for the first event, then fills the batch for up to
+        INGEST_BATCH_WAIT_MS or INGEST_BATCH_SIZE events, whichever comes
+        first, and persists the lot in one transaction — many small WAL
+        fsyncs collapse into one.
+        """
+        loop = asyncio.get_running_loop()
+        while self.running:
+            batch = [await self._event_queue.get()]
+            deadline = loop.time() + self.config.INGEST_BATCH_WAIT_MS / 1000.0
+            while len(batch) < self.config.INGEST_BATCH_SIZE:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(
+                        await asyncio.wait_for(self._event_queue.get(), remaining)
+                    )
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                async with AsyncSessionLocal() as db:
+                    await db.run_sync(self._persist_event_batch, batch)
+                logger.debug("Committed batch of %d events", len(batch))
+            except Exception as e:
+                logger.error(
+                    "Failed to persist batch of %d events: %s", len(batch), e
+                )
+
+    def _persist_event_batch(self, db: Session, batch: List[Dict[str, Any]]):
+        """Persist a batch of events inside a single transaction."""
+        for event_data in batch:
+            character_manager.create_characters_from_event(
+                db, event_data, commit=False
+            )
+        db.commit()
+
     async def process_recognition_event(
-        self, 
+        self,
         event_data: Dict[str, Any],
-        db: Session
+        db: AsyncSession
     ) -> List[Character]:
         """
         Process a new recognition event.
@@ -74,12 +398,14 @@ class AggregatorService:
             List of created/updated characters
         """
         try:
-            # Add to event buffer for sliding window
-            event_data['processed_at'] = datetime.now(timezone.utc).isoformat()
-            self.event_buffer.append(event_data)
-            
-            # Create/update characters
-            characters = character_manager.create_characters_from_event(db, event_data)
+            # Add to event buffer and maintain incremental window stats
+            self._ingest_event_stats(event_data)
+
+            # Create/update characters; run_sync hands the ORM helpers a
+            # sync-facade session while I/O awaits on the async driver
+            characters = await db.run_sync(
+                character_manager.create_characters_from_event, event_data
+            )
             
             logger.info(
                 f"Processed event from {event_data['source']}: "
@@ -110,27 +436,39 @@ class AggregatorService:
         Returns:
             StoryInput payload for story generation
         """
+        # Serve repeat polls from the TTL cache; since is bucketed to the
+        # minute so trivially different timestamps share an entry
+        cache_key = (
+            since.replace(second=0, microsecond=0) if since else None,
+            window_minutes,
+        )
+        cached = self._summary_cache.get(cache_key)
+        if cached is not None and time.monotonic() < cached[0]:
+            return cached[1]
+
+        use_window_stats = (
+            since is None
+            and window_minutes in (None, self.config.WINDOW_SIZE_MINUTES)
+        )
         if since is None:
             window_minutes = window_minutes or self.config.WINDOW_SIZE_MINUTES
             since = datetime.now(timezone.utc) - timedelta(minutes=window_minutes)
-        
+
         end_time = datetime.now(timezone.utc)
-        
+
         # Get active characters in timeframe
         active_characters = character_manager.get_active_characters_in_timeframe(
             db, since, end_time
         )
         
-        # Get recent recognition events
-        recent_events = (
-            db.query(RecognitionEventDB)
-            .filter(RecognitionEventDB.timestamp >= since)
-            .order_by(RecognitionEventDB.timestamp.desc())
-            .all()
-        )
-        
-        # Aggregate species activity
-        species_activity = self._aggregate_species_activity(recent_events)
+        # Aggregate species activity; the default window comes straight
+        # from the incremental stats (O(species)), custom ranges rescan.
+        # Column-only selects skip ORM hydration for these read-only rows.
+        if use_window_stats:
+            self._evict_expired(end_time)
+            species_activity = self._window_snapshot()
+        else:
+            species_activity = self._aggregate_species_activity(db, since)
         
         # Limit characters for story coherence
         characters_for_story = active_characters[:self.config.MAX_CHARACTERS_PER_STORY]
@@ -149,17 +487,35 @@ class AggregatorService:
                 "personality_notes": char.notes
             })
         
-        # Format recent activity
-        activity_data = []
-        for event in recent_events[:20]:  # Limit recent activity
-            activity_data.append({
-                "timestamp": event.timestamp.isoformat(),
-                "source": event.source,
-                "species": event.species,
-                "count": event.count,
-                "confidence": event.confidence,
-                "character_id": event.character_id
-            })
+        # Format recent activity; the 20-row limit is pushed into SQL so
+        # only the rows that end up in the payload cross the wire
+        activity_rows = db.execute(
+            select(
+                RecognitionEventDB.timestamp,
+                RecognitionEventDB.source,
+                RecognitionEventDB.species,
+                RecognitionEventDB.count,
+                RecognitionEventDB.confidence,
+                RecognitionEventDB.character_id,
+            )
+            .where(
+                RecognitionEventDB.id >= _event_id_floor(since),
+                RecognitionEventDB.timestamp >= since,
+            )
+            .order_by(RecognitionEventDB.timestamp.desc())
+            .limit(20)
+        )
+        activity_data = [
+            {
+                "timestamp": row.timestamp.isoformat(),
+                "source": row.source,
+                "species": row.species,
+                "count": row.count,
+                "confidence": row.confidence,
+                "character_id": row.character_id
+            }
+            for row in activity_rows
+        ]
         
         # Create story input payload
         story_input = StoryInput(
@@ -174,85 +530,153 @@ class AggregatorService:
         )
         
         # Store aggregation summary
-        self._store_aggregation_summary(db, since, end_time, story_input)
-        
+        self._store_aggregation_summary(
+            db, since, end_time, story_input, species_activity
+        )
+
+        if len(self._summary_cache) >= self.config.SUMMARY_CACHE_MAX_ENTRIES:
+            self._summary_cache.clear()
+        self._summary_cache[cache_key] = (
+            time.monotonic() + self.config.SUMMARY_CACHE_TTL_SECONDS,
+            story_input,
+        )
+
         return story_input
     
     def _aggregate_species_activity(
-        self, 
-        events: List[RecognitionEventDB]
+        self,
+        db: Session,
+        since: datetime
     ) -> Dict[str, Dict[str, Any]]:
-        """Aggregate species-level activity metrics."""
-        species_stats = defaultdict(lambda: {
-            'total_detections': 0,
-            'total_count': 0,
-            'avg_confidence': 0.0,
-            'sources': set(),
-            'last_seen': None
-        })
-        
-        for event in events:
-            stats = species_stats[event.species]
-            stats['total_detections'] += 1
-            stats['total_count'] += event.count
-            stats['sources'].add(event.source)
-            
-            # Update average confidence
-            prev_avg = stats['avg_confidence']
-            stats['avg_confidence'] = (
-                prev_avg * (stats['total_detections'] - 1) + event.confidence
-            ) / stats['total_detections']
-            
-            # Update last seen
-            if stats['last_seen'] is None or event.timestamp > stats['last_seen']:
-                stats['last_seen'] = event.timestamp
-        
-        # Convert sets to lists for JSON serialization
-        for species in species_stats:
-            species_stats[species]['sources'] = list(species_stats[species]['sources'])
-            if species_stats[species]['last_seen']:
-                species_stats[species]['last_seen'] = species_stats[species]['last_seen'].isoformat()
-        
-        return dict(species_stats)
+        """Aggregate species-level activity metrics in the database.
+
+        One GROUP BY pass replaces the old per-row Python loop (and the
+        incremental-mean drift that came with it).
+        """
+        rows = db.execute(
+            select(
+                RecognitionEventDB.species,
+                func.count().label('total_detections'),
+                func.sum(RecognitionEventDB.count).label('total_count'),
+                func.avg(RecognitionEventDB.confidence).label('avg_confidence'),
+                func.max(RecognitionEventDB.timestamp).label('last_seen'),
+            )
+            .where(
+                RecognitionEventDB.id >= _event_id_floor(since),
+                RecognitionEventDB.timestamp >= since,
+            )
+            .group_by(RecognitionEventDB.species)
+        )
+
+        species_stats = {
+            row.species: {
+                'total_detections': row.total_detections,
+                'total_count': row.total_count,
+                'avg_confidence': row.avg_confidence,
+                'sources': [],
+                'last_seen': (
+                    row.last_seen.isoformat() if row.last_seen else None
+                ),
+            }
+            for row in rows
+        }
+
+        # Distinct sources per species; a small second query keeps the
+        # aggregation portable across SQLite and PostgreSQL (no array_agg)
+        source_rows = db.execute(
+            select(RecognitionEventDB.species, RecognitionEventDB.source)
+            .where(
+                RecognitionEventDB.id >= _event_id_floor(since),
+                RecognitionEventDB.timestamp >= since,
+            )
+            .distinct()
+        )
+        for species, source in source_rows:
+            stats = species_stats.get(species)
+            if stats is not None:
+                stats['sources'].append(source)
+
+        return species_stats
     
     def _store_aggregation_summary(
         self,
         db: Session,
         start_time: datetime,
         end_time: datetime,
-        story_input: StoryInput
+        story_input: StoryInput,
+        species_activity: Dict[str, Dict[str, Any]]
     ):
-        """Store aggregation summary in database."""
+        """Store aggregation summary in database.
+
+        Writes the already-computed aggregates straight into the model's
+        columns rather than re-walking the story payload into a second
+        serialized copy.
+        """
         try:
+            total_detections = sum(
+                stats['total_detections'] for stats in species_activity.values()
+            )
+            average_confidence = (
+                sum(
+                    stats['avg_confidence'] * stats['total_detections']
+                    for stats in species_activity.values()
+                ) / total_detections
+                if total_detections else 0.0
+            )
+
             summary = AggregationSummary(
                 start_time=start_time,
                 end_time=end_time,
-                character_count=len(story_input.characters),
-                species_count=len(story_input.species),
-                event_count=len(story_input.recent_activity),
-                summary_data=story_input.dict()
+                species_counts={
+                    species: stats['total_count']
+                    for species, stats in species_activity.items()
+                },
+                active_characters=[
+                    {"id": char["id"], "species": char["species"]}
+                    for char in story_input.characters
+                ],
+                total_detections=total_detections,
+                average_confidence=average_confidence,
             )
-            
+
             db.add(summary)
             db.commit()
-            
+
             logger.debug(f"Stored aggregation summary: {start_time} - {end_time}")
-            
+
         except Exception as e:
             db.rollback()
             logger.error(f"Failed to store aggregation summary: {e}")
     
-    async def cleanup_old_events(self, db: Session, hours_ago: int = 24):
-        """Clean up old recognition events."""
+    async def cleanup_old_events(self, db: AsyncSession, hours_ago: int = 24):
+        """Clean up old recognition events.
+
+        Deletes in bounded batches with a commit per batch: one giant
+        DELETE would hold row locks and bloat the WAL for the whole run,
+        stalling concurrent ingest.
+        """
         cutoff_time = datetime.now(timezone.utc) - timedelta(hours=hours_ago)
-        
-        deleted_count = (
-            db.query(RecognitionEventDB)
-            .filter(RecognitionEventDB.timestamp < cutoff_time)
-            .delete()
-        )
-        
-        db.commit()
+        batch_size = self.config.CLEANUP_BATCH_SIZE
+
+        deleted_count = 0
+        while True:
+            batch_ids = (
+                await db.execute(
+                    select(RecognitionEventDB.id)
+                    .where(RecognitionEventDB.timestamp < cutoff_time)
+                    .limit(batch_size)
+                )
+            ).scalars().all()
+            if not batch_ids:
+                break
+
+            result = await db.execute(
+                delete(RecognitionEventDB)
+                .where(RecognitionEventDB.id.in_(batch_ids))
+            )
+            await db.commit()
+            deleted_count += result.rowcount
+
         logger.info(f"Cleaned up {deleted_count} old recognition events")
 
 
@@ -264,7 +688,8 @@ aggregator_service = AggregatorService()
 app = FastAPI(
     title="Birds with Friends - Event Aggregator",
     description="Collects recognition events and provides aggregated summaries for story generation",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=_DefaultResponseClass
 )
 
 
@@ -288,25 +713,31 @@ async def shutdown_event():
     logger.info("Aggregator service stopped")
 
 
-@app.post("/events", response_model=Dict[str, Any])
+@app.post("/events", status_code=202)
 async def receive_recognition_event(
     event_data: Dict[str, Any],
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Receive and process recognition events from audio/image services.
-    
-    Expected event format matches recognition service output.
+
+    Events are queued and persisted in batched transactions by a
+    background consumer, so the response does not wait on the database
+    write. Expected event format matches recognition service output.
     """
     try:
+        if aggregator_service.enqueue_recognition_event(event_data):
+            return {"status": "accepted"}
+
+        # Consumer not running (e.g. direct service use): process inline
         characters = await aggregator_service.process_recognition_event(event_data, db)
-        
+
         return {
             "status": "processed",
             "characters_affected": len(characters),
             "character_ids": [c.id for c in characters]
         }
-        
+
     except Exception as e:
         logger.error(f"Failed to process event: {e}")
         raise HTTPException(status_code=400, detail=str(e))
@@ -316,7 +747,7 @@ async def receive_recognition_event(
 async def get_aggregation_summary(
     since: Optional[str] = Query(None, description="Start time (ISO format)"),
     window_minutes: Optional[int] = Query(15, description="Aggregation window in minutes"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get aggregated summary for story generation.
@@ -324,13 +755,13 @@ async def get_aggregation_summary(
     Returns story input payload with characters, species, and recent activity.
     """
     try:
-        # Parse since parameter
+        # Parse since parameter (C parser when ciso8601 is installed)
         since_dt = None
         if since:
-            since_dt = datetime.fromisoformat(since.replace('Z', '+00:00'))
+            since_dt = _parse_timestamp(since)
         
-        story_input = aggregator_service.get_aggregated_summary(
-            db, since_dt, window_minutes
+        story_input = await db.run_sync(
+            aggregator_service.get_aggregated_summary, since_dt, window_minutes
         )
         
         return story_input
@@ -340,20 +771,38 @@ async def get_aggregation_summary(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/characters", response_model=List[Dict[str, Any]])
+@app.get("/characters")
 async def get_characters(
-    skip: int = Query(0, ge=0),
+    response: Response,
+    cursor: Optional[str] = Query(
+        None, description="Opaque pagination cursor from X-Next-Cursor"
+    ),
     limit: int = Query(100, ge=1, le=1000),
     species: Optional[str] = Query(None, description="Filter by species"),
     archetype: Optional[str] = Query(None, description="Filter by archetype"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get list of characters with optional filtering."""
+    """Get a page of characters with optional filtering.
+
+    Pagination is keyset-based: the X-Next-Cursor response header holds
+    the cursor for the following page, empty when exhausted.
+    """
     try:
-        characters = character_manager.get_characters(
-            db, skip, limit, species, archetype
+        parsed_cursor = None
+        if cursor:
+            last_seen_str, _, last_id = cursor.partition("|")
+            parsed_cursor = (datetime.fromisoformat(last_seen_str), last_id)
+
+        characters, next_cursor = await db.run_sync(
+            character_manager.get_characters,
+            parsed_cursor, limit, species, archetype
         )
-        
+
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = (
+                f"{next_cursor[0].isoformat()}|{next_cursor[1]}"
+            )
+
         return [
             {
                 "id": c.id,
@@ -373,13 +822,15 @@ async def get_characters(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/characters/{character_id}", response_model=Dict[str, Any])
+@app.get("/characters/{character_id}")
 async def get_character(
     character_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get specific character by ID."""
-    character = character_manager.get_character_by_id(db, character_id)
+    character = await db.run_sync(
+        character_manager.get_character_by_id, character_id
+    )
     
     if not character:
         raise HTTPException(status_code=404, detail="Character not found")
@@ -396,19 +847,19 @@ async def get_character(
     }
 
 
-@app.patch("/characters/{character_id}", response_model=Dict[str, Any])
+@app.patch("/characters/{character_id}")
 async def update_character(
     character_id: str,
     updates: Dict[str, Any],
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update character information."""
     from .models import CharacterUpdate
     
     try:
         character_update = CharacterUpdate(**updates)
-        updated_character = character_manager.update_character(
-            db, character_id, character_update
+        updated_character = await db.run_sync(
+            character_manager.update_character, character_id, character_update
         )
         
         if not updated_character:
@@ -432,29 +883,43 @@ async def update_character(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/stats", response_model=Dict[str, Any])
-async def get_system_stats(db: Session = Depends(get_db)):
+@app.get("/stats")
+async def get_system_stats(db: AsyncSession = Depends(get_async_db)):
     """Get system statistics."""
     try:
         # Character count by species
-        species_counts = character_manager.get_character_count_by_species(db)
-        
+        species_counts = await db.run_sync(
+            character_manager.get_character_count_by_species
+        )
+
         # Total counts
         total_characters = sum(species_counts.values())
-        
+
         # Recent activity (last hour)
         since_hour = datetime.now(timezone.utc) - timedelta(hours=1)
         recent_events = (
-            db.query(RecognitionEventDB)
-            .filter(RecognitionEventDB.timestamp >= since_hour)
-            .count()
-        )
+            await db.execute(
+                select(func.count())
+                .select_from(RecognitionEventDB)
+                .where(
+                    RecognitionEventDB.id >= _event_id_floor(since_hour),
+                    RecognitionEventDB.timestamp >= since_hour,
+                )
+            )
+        ).scalar()
         
+        # In-memory buffer activity over the sliding window
+        window_start = datetime.now(timezone.utc) - timedelta(
+            minutes=aggregator_service.config.WINDOW_SIZE_MINUTES
+        )
+        buffer_activity = aggregator_service.buffer_species_activity(window_start)
+
         return {
             "total_characters": total_characters,
             "species_counts": species_counts,
             "recent_events_1h": recent_events,
             "buffer_size": len(aggregator_service.event_buffer),
+            "buffer_species_activity": buffer_activity,
             "service_status": "running" if aggregator_service.running else "stopped"
         }
         
@@ -467,39 +932,44 @@ async def get_system_stats(db: Session = Depends(get_db)):
 async def get_snapshots(limit: int = 10):
     """Get recent snapshots from recognition events."""
     try:
-        db = SessionLocal()
-        
-        # Get recent recognition events with snapshots
-        events = db.query(RecognitionEvent)\
-            .join(Snapshot)\
-            .order_by(RecognitionEvent.timestamp.desc())\
-            .limit(limit)\
-            .all()
-        
+        # One flat joined query; the old per-event snapshot loop issued a
+        # lazy-load SELECT for every returned event
+        async with AsyncSessionLocal() as db:
+            rows = (
+                await db.execute(
+                    select(
+                        Snapshot.id,
+                        Snapshot.url,
+                        Snapshot.timestamp,
+                        RecognitionEvent.payload_json,
+                    )
+                    .join(Snapshot.source_event)
+                    .order_by(Snapshot.timestamp.desc())
+                    .limit(limit)
+                )
+            ).all()
+
         snapshots = []
-        for event in events:
-            for snapshot in event.snapshots:
-                snapshots.append({
-                    "id": str(snapshot.id),
-                    "image_url": snapshot.url,
-                    "audio_url": None,  # Add audio URL if available
-                    "timestamp": event.timestamp.isoformat(),
-                    "detections": [{
-                        "species": event.species,
-                        "confidence": event.confidence,
-                        "bounding_box": None  # Add if bounding box data available
-                    }] if event.species else []
-                })
-        
-        return snapshots[:limit]
-    
+        for snapshot_id, url, timestamp, payload in rows:
+            detections = (payload or {}).get('detections', [])
+            snapshots.append({
+                "id": str(snapshot_id),
+                "image_url": url,
+                "audio_url": None,  # Add audio URL if available
+                "timestamp": timestamp.isoformat() if timestamp else None,
+                "detections": [{
+                    "species": detection.get("species"),
+                    "confidence": detection.get("confidence"),
+                    "bounding_box": detection.get("bbox")
+                } for detection in detections]
+            })
+
+        return snapshots
+
     except Exception as e:
         logger.error(f"Failed to get snapshots: {e}")
         # Return empty list if no data available yet
         return []
-    finally:
-        if 'db' in locals():
-            db.close()
 
 
 @app.get("/health")
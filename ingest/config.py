@@ -1,6 +1,7 @@
 """
 Configuration management for the ingest service.
 """
+from functools import lru_cache
 from pydantic_settings import BaseSettings
 from typing import Optional
 import os
@@ -15,6 +16,7 @@ class Settings(BaseSettings):
     # Sampling configuration
     sample_interval: int = 10  # seconds between captures
     audio_duration: int = 5    # duration of audio clips in seconds
+    mock_audio_noise: bool = False  # add faint noise to fallback audio clips
     
     # Output configuration
     output_dir: str = "./output"
@@ -30,10 +32,16 @@ class Settings(BaseSettings):
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
+        frozen = True  # Immutable, so the cached instance is safely shared
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Get application settings instance."""
+    """Get the application settings instance.
+
+    Memoized: constructing Settings re-reads the environment and .env
+    file, which callers should not pay for on every lookup.
+    """
     return Settings()
 
 
@@ -3,17 +3,33 @@ BirdCAGE Audio Recognition Service
 
 HTTP adapter for BirdCAGE audio recognition model.
 """
+import io
 import logging
 import random
 from typing import List, BinaryIO
 from pathlib import Path
 
+import httpx
+
+try:
+    import numpy as np
+except ImportError:  # Optional; recognition falls back to random-module loops
+    np = None
+
 from ..shared.base import BaseRecognizer
 from ..shared.schemas import Detection
 from ..shared.config import AudioRecognitionSettings
 
 logger = logging.getLogger(__name__)
 
+# Mock detections are generated inside the ranges declared below, so
+# re-validating them in the pydantic constructor is redundant work;
+# model_construct skips it. Flip to False to route construction back
+# through full validation.
+TRUSTED_INPUTS = True
+
+_DETECTION_FACTORY = Detection.model_construct if TRUSTED_INPUTS else Detection
+
 
 class MockBirdCAGERecognizer:
     """
@@ -39,6 +55,10 @@ class MockBirdCAGERecognizer:
     def __init__(self, model_path: str = None, config_path: str = None):
         self.model_path = model_path
         self.config_path = config_path
+        # Per-instance RNG: the random module's global singleton is shared
+        # (and locked) across threads, so concurrent recognizers would
+        # serialize on it
+        self._rng = random.Random()
         logger.info("Mock BirdCAGE recognizer initialized")
     
     def recognize(self, audio_path: Path) -> List[Detection]:
@@ -51,38 +71,80 @@ class MockBirdCAGERecognizer:
         Returns:
             List of mock detections
         """
-        logger.info(f"Processing audio file: {audio_path}")
+        logger.info("Processing audio file: %s", audio_path)
         
         # Simulate processing time and variable results
         detections = []
         
         # Randomly detect 0-3 species
-        num_detections = random.randint(0, 3)
+        num_detections = self._rng.randint(0, 3)
         
-        if num_detections > 0:
+        if num_detections > 0 and np is not None:
+            # Vectorized path: sample species indices, confidences and
+            # counts in whole-array operations instead of per-tuple loops
+            idx = _RNG.choice(len(_SPECIES_NAMES), size=num_detections, replace=False)
+            confidences = _RNG.uniform(_CONF_MIN[idx], _CONF_MAX[idx])
+            # 30% chance of multiple individuals
+            counts = np.where(
+                _RNG.random(num_detections) < 0.3,
+                _RNG.integers(2, 5, num_detections),
+                1
+            )
+
+            for species_name, confidence, count in zip(
+                _SPECIES_NAMES[idx], confidences, counts
+            ):
+                detection = _DETECTION_FACTORY(
+                    species=species_name,
+                    count=int(count),
+                    confidence=float(confidence)
+                )
+                detections.append(detection)
+
+                logger.info("Detected: %s (count=%d, confidence=%.3f)", species_name, count, confidence)
+
+        elif num_detections > 0:
             # Select random species
-            selected_species = random.sample(self.SPECIES_DATABASE, num_detections)
-            
+            selected_species = self._rng.sample(self.SPECIES_DATABASE, num_detections)
+
             for species_name, min_conf, max_conf in selected_species:
-                confidence = random.uniform(min_conf, max_conf)
-                
+                confidence = self._rng.uniform(min_conf, max_conf)
+
                 # Occasionally detect multiple individuals
                 count = 1
-                if random.random() < 0.3:  # 30% chance of multiple
-                    count = random.randint(2, 4)
-                
-                detection = Detection(
+                if self._rng.random() < 0.3:  # 30% chance of multiple
+                    count = self._rng.randint(2, 4)
+
+                detection = _DETECTION_FACTORY(
                     species=species_name,
                     count=count,
                     confidence=confidence
                 )
                 detections.append(detection)
-                
-                logger.info(f"Detected: {species_name} (count={count}, confidence={confidence:.3f})")
-        
+
+                logger.info("Detected: %s (count=%d, confidence=%.3f)", species_name, count, confidence)
+
         return detections
 
 
+# Structure-of-arrays view of the species table: one vectorized uniform()
+# over these replaces a Python loop of per-species random calls
+if np is not None:
+    _SPECIES_NAMES = np.array(
+        [name for name, _, _ in MockBirdCAGERecognizer.SPECIES_DATABASE],
+        dtype=object
+    )
+    _CONF_MIN = np.array(
+        [lo for _, lo, _ in MockBirdCAGERecognizer.SPECIES_DATABASE],
+        dtype=np.float32
+    )
+    _CONF_MAX = np.array(
+        [hi for _, _, hi in MockBirdCAGERecognizer.SPECIES_DATABASE],
+        dtype=np.float32
+    )
+    _RNG = np.random.default_rng()
+
+
 class AudioRecognizer(BaseRecognizer):
     """BirdCAGE audio recognition adapter."""
     
@@ -94,6 +156,12 @@ class AudioRecognizer(BaseRecognizer):
             model_path=settings.birdcage_model_path,
             config_path=settings.birdcage_config_path
         )
+
+        # Frozen lookup set: the settings list is O(n) to scan and never
+        # changes after init
+        self._allowed_audio = frozenset(
+            x.lower().lstrip('.') for x in settings.allowed_audio_types
+        )
         
         logger.info("AudioRecognizer initialized")
     
@@ -107,12 +175,19 @@ class AudioRecognizer(BaseRecognizer):
         Returns:
             List of detections
         """
-        # TODO: Download audio file from URL
-        # For now, simulate processing
-        logger.warning(f"URL recognition not fully implemented: {url}")
-        
-        # Mock detection based on URL
-        return self.model.recognize(Path("mock_audio.wav"))
+        try:
+            data = await self.fetch_url(url)
+        except httpx.HTTPError as e:
+            logger.warning("Failed to fetch audio URL %s: %s", url, e)
+            raise ValueError(f"Could not fetch audio URL: {url}")
+
+        # The decoder wants a path, so stage the download in a pooled
+        # temp file (suffix taken from the URL path)
+        temp_path = self.save_temp_file(io.BytesIO(data), url.split("?", 1)[0])
+        try:
+            return await self.run_inference(self.model.recognize, temp_path)
+        finally:
+            self.cleanup_temp_file(temp_path)
     
     async def recognize_from_file(self, file_data: BinaryIO, filename: str) -> List[Detection]:
         """
@@ -127,16 +202,19 @@ class AudioRecognizer(BaseRecognizer):
         """
         temp_path = None
         try:
-            # Save to temporary file
-            temp_path = self.save_temp_file(file_data, filename)
+            # Save to temporary file, enforcing the size cap mid-stream
+            temp_path = self.save_temp_file(
+                file_data, filename,
+                max_bytes=self.settings.max_file_size
+            )
             
             # Validate audio format
             if not self._is_valid_audio_file(temp_path):
                 raise ValueError(f"Unsupported audio format: {filename}")
             
-            # Run recognition
-            detections = self.model.recognize(temp_path)
-            
+            # Run recognition off the event loop
+            detections = await self.run_inference(self.model.recognize, temp_path)
+
             return detections
             
         finally:
@@ -145,5 +223,7 @@ class AudioRecognizer(BaseRecognizer):
     
     def _is_valid_audio_file(self, file_path: Path) -> bool:
         """Check if file is a valid audio format."""
-        suffix = file_path.suffix.lower().lstrip('.')
-        return suffix in self.settings.allowed_audio_types
\ No newline at end of file
+        # rpartition does the suffix split in one pass; Path.suffix plus
+        # lstrip would build two extra temporaries per call
+        suffix = file_path.name.rpartition('.')[2].lower()
+        return suffix in self._allowed_audio
\ No newline at end of file
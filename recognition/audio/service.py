@@ -5,11 +5,20 @@ FastAPI service for audio-based bird recognition using BirdCAGE.
 """
 import logging
 from typing import Optional, Union
-from fastapi import FastAPI, File, UploadFile, HTTPException, Form
+from fastapi import FastAPI, File, UploadFile, HTTPException, Form, Query
 from fastapi.responses import JSONResponse
 
+try:
+    # orjson serializes responses in C; fall back to stdlib json without it
+    import orjson  # noqa: F401 — required by ORJSONResponse at runtime
+    from fastapi.responses import ORJSONResponse as _DefaultResponseClass
+except ImportError:
+    _DefaultResponseClass = JSONResponse
+
 from ..shared.schemas import RecognitionEvent, RecognitionRequest
-from ..shared.config import AudioRecognitionSettings
+from ..shared.base import FileTooLargeError, read_upload_async
+from ..shared.streaming import maybe_stream_event
+from ..shared.config import AudioRecognitionSettings, get_audio_settings
 from .recognizer import AudioRecognizer
 
 # Configure logging
@@ -17,17 +26,24 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Initialize settings and recognizer
-settings = AudioRecognitionSettings()
+settings = get_audio_settings()
 recognizer = AudioRecognizer(settings)
 
 # FastAPI app
 app = FastAPI(
     title="Birds with Friends - Audio Recognition Service",
     description="BirdCAGE adapter for audio-based bird species recognition",
-    version="0.1.0"
+    version="0.1.0",
+    default_response_class=_DefaultResponseClass
 )
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release the pooled HTTP client."""
+    await recognizer.aclose()
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
@@ -43,7 +59,8 @@ async def health_check():
 @app.post("/recognize", response_model=RecognitionEvent)
 async def recognize_audio(
     file: Optional[UploadFile] = File(None),
-    url: Optional[str] = Form(None)
+    url: Optional[str] = Form(None),
+    stream: bool = Query(False)
 ):
     """
     Recognize bird species from audio input.
@@ -51,6 +68,7 @@ async def recognize_audio(
     Args:
         file: Uploaded audio file (WAV, MP3, M4A, FLAC)
         url: URL to audio file
+        stream: Stream the response incrementally for large events
         
     Returns:
         RecognitionEvent with detections and character instances
@@ -73,15 +91,17 @@ async def recognize_audio(
         snapshot_url = None
         
         if file:
-            # Validate file size
-            if file.size > settings.max_file_size:
-                raise HTTPException(
-                    status_code=413,
-                    detail=f"File too large. Maximum size: {settings.max_file_size} bytes"
-                )
-            
-            # Process uploaded file
-            detections = await recognizer.recognize_from_file(file.file, file.filename)
+            # Stream the upload in cooperative chunks so big files don't
+            # block the event loop; size is enforced mid-stream rather
+            # than trusting the client-reported length (see
+            # FileTooLargeError handler below)
+            buffered = await read_upload_async(
+                file, max_bytes=settings.max_file_size
+            )
+            try:
+                detections = await recognizer.recognize_from_file(buffered, file.filename)
+            finally:
+                buffered.close()
             snapshot_url = f"uploaded://{file.filename}"
             
         elif url:
@@ -97,9 +117,14 @@ async def recognize_audio(
         )
         
         logger.info(f"Recognition complete: {len(detections)} detections, {len(event.characters)} characters")
+
+        # Large flocks can opt into incremental serialization
+        return maybe_stream_event(event, stream)
         
-        return event
-        
+    except FileTooLargeError as e:
+        logger.warning(f"Upload rejected: {e}")
+        raise HTTPException(status_code=413, detail=str(e))
+
     except ValueError as e:
         logger.error(f"Validation error: {e}")
         raise HTTPException(status_code=400, detail=str(e))
@@ -120,7 +145,7 @@ async def root():
             "health": "/health",
             "recognize": "/recognize"
         },
-        "supported_formats": settings.allowed_audio_types,
+        "supported_formats": sorted(settings.allowed_audio_types),
         "max_file_size": settings.max_file_size,
         "min_confidence": settings.min_confidence
     }
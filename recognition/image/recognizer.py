@@ -3,17 +3,76 @@ WhosAtMyFeeder Image Recognition Service
 
 HTTP adapter for WhosAtMyFeeder image recognition model.
 """
+import hashlib
+import io
 import logging
 import random
-from typing import List, BinaryIO
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional, BinaryIO
 from pathlib import Path
 
+import httpx
+
+try:
+    import numpy as np
+except ImportError:  # Optional; recognition falls back to random-module loops
+    np = None
+
 from ..shared.base import BaseRecognizer
 from ..shared.schemas import Detection, BoundingBox
 from ..shared.config import ImageRecognitionSettings
 
 logger = logging.getLogger(__name__)
 
+# Mock detections are generated inside the ranges declared below, so
+# re-validating them in the pydantic constructor is redundant work;
+# model_construct skips it. Flip to False to route construction back
+# through full validation.
+TRUSTED_INPUTS = True
+
+_DETECTION_FACTORY = Detection.model_construct if TRUSTED_INPUTS else Detection
+_BBOX_FACTORY = BoundingBox.model_construct if TRUSTED_INPUTS else BoundingBox
+
+
+class PredictionCache:
+    """Content-addressed cache of detection lists.
+
+    Feeder streams re-send near-identical frames, and story regeneration
+    re-analyzes images it has already seen; both pay full inference cost
+    without a cache. Entries are keyed by image digest (plus model
+    version and threshold, so a config change never serves stale
+    results) and evicted LRU-first with a TTL backstop.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key) -> Optional[List["Detection"]]:
+        """Return the cached detections for key, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, detections = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return detections
+
+    def put(self, key, detections: List["Detection"]) -> None:
+        """Store detections for key, evicting the oldest entry if full."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, detections)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
 
 class MockWhosAtMyFeederRecognizer:
     """
@@ -38,54 +97,101 @@ class MockWhosAtMyFeederRecognizer:
         ("Downy Woodpecker", 0.81, 0.95),
     ]
     
+    # Identifies the weights for cache keying; a model upgrade must not
+    # serve predictions cached under the old version
+    MODEL_VERSION = "mock-1"
+
     def __init__(self, model_path: str = None, config_path: str = None):
         self.model_path = model_path
         self.config_path = config_path
+        # Per-instance RNG: the random module's global singleton is shared
+        # (and locked) across threads, so concurrent recognizers would
+        # serialize on it
+        self._rng = random.Random()
         logger.info("Mock WhosAtMyFeeder recognizer initialized")
     
-    def recognize(self, image_path: Path) -> List[Detection]:
+    def recognize(self, image_source) -> List[Detection]:
         """
         Mock image recognition.
-        
+
         Args:
-            image_path: Path to image file
-            
+            image_source: Path to image file or readable binary buffer
+
         Returns:
             List of mock detections with bounding boxes
         """
-        logger.info(f"Processing image file: {image_path}")
+        logger.info("Processing image input: %s", image_source)
         
         # Simulate processing time and variable results
         detections = []
         
         # Randomly detect 0-4 species (images can show multiple birds)
-        num_detections = random.randint(0, 4)
+        num_detections = self._rng.randint(0, 4)
         
-        if num_detections > 0:
+        if num_detections > 0 and np is not None:
+            # Vectorized path: species indices, confidences, bboxes and
+            # counts all sampled in whole-array operations
+            idx = _RNG.choice(len(_SPECIES_NAMES), size=num_detections, replace=False)
+            confidences = _RNG.uniform(_CONF_MIN[idx], _CONF_MAX[idx])
+            xs = _RNG.uniform(0.1, 0.6, num_detections)
+            ys = _RNG.uniform(0.1, 0.6, num_detections)
+            widths = _RNG.uniform(0.15, 0.4, num_detections)
+            heights = _RNG.uniform(0.15, 0.4, num_detections)
+            # 20% chance of multiple in same area
+            counts = np.where(
+                _RNG.random(num_detections) < 0.2,
+                _RNG.integers(2, 4, num_detections),
+                1
+            )
+
+            for i, species_name in enumerate(_SPECIES_NAMES[idx]):
+                bbox = _BBOX_FACTORY(
+                    x=float(xs[i]),
+                    y=float(ys[i]),
+                    width=float(widths[i]),
+                    height=float(heights[i])
+                )
+                detection = _DETECTION_FACTORY(
+                    species=species_name,
+                    count=int(counts[i]),
+                    confidence=float(confidences[i]),
+                    bbox=bbox
+                )
+                detections.append(detection)
+
+                # BoundingBox.__repr__ is not free; skip it entirely when
+                # INFO records would be dropped anyway
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(
+                        "Detected: %s (count=%d, confidence=%.3f, bbox=%s)",
+                        species_name, counts[i], confidences[i], bbox
+                    )
+
+        elif num_detections > 0:
             # Select random species
-            selected_species = random.sample(
-                self.SPECIES_DATABASE, 
+            selected_species = self._rng.sample(
+                self.SPECIES_DATABASE,
                 min(num_detections, len(self.SPECIES_DATABASE))
             )
-            
+
             for species_name, min_conf, max_conf in selected_species:
-                confidence = random.uniform(min_conf, max_conf)
+                confidence = self._rng.uniform(min_conf, max_conf)
                 
                 # Generate random bounding box
-                x = random.uniform(0.1, 0.6)
-                y = random.uniform(0.1, 0.6)
-                width = random.uniform(0.15, 0.4)
-                height = random.uniform(0.15, 0.4)
+                x = self._rng.uniform(0.1, 0.6)
+                y = self._rng.uniform(0.1, 0.6)
+                width = self._rng.uniform(0.15, 0.4)
+                height = self._rng.uniform(0.15, 0.4)
                 
-                bbox = BoundingBox(x=x, y=y, width=width, height=height)
+                bbox = _BBOX_FACTORY(x=x, y=y, width=width, height=height)
                 
                 # Image recognition typically detects single individuals per bbox
                 # But occasionally might detect flocks
                 count = 1
-                if random.random() < 0.2:  # 20% chance of multiple in same area
-                    count = random.randint(2, 3)
+                if self._rng.random() < 0.2:  # 20% chance of multiple in same area
+                    count = self._rng.randint(2, 3)
                 
-                detection = Detection(
+                detection = _DETECTION_FACTORY(
                     species=species_name,
                     count=count,
                     confidence=confidence,
@@ -93,14 +199,40 @@ class MockWhosAtMyFeederRecognizer:
                 )
                 detections.append(detection)
                 
-                logger.info(f"Detected: {species_name} (count={count}, confidence={confidence:.3f}, bbox={bbox})")
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(
+                        "Detected: %s (count=%d, confidence=%.3f, bbox=%s)",
+                        species_name, count, confidence, bbox
+                    )
         
         return detections
 
 
+# Structure-of-arrays view of the species table (see the audio
+# recognizer for the same pattern)
+if np is not None:
+    _SPECIES_NAMES = np.array(
+        [name for name, _, _ in MockWhosAtMyFeederRecognizer.SPECIES_DATABASE],
+        dtype=object
+    )
+    _CONF_MIN = np.array(
+        [lo for _, lo, _ in MockWhosAtMyFeederRecognizer.SPECIES_DATABASE],
+        dtype=np.float32
+    )
+    _CONF_MAX = np.array(
+        [hi for _, _, hi in MockWhosAtMyFeederRecognizer.SPECIES_DATABASE],
+        dtype=np.float32
+    )
+    _RNG = np.random.default_rng()
+
+
 class ImageRecognizer(BaseRecognizer):
     """WhosAtMyFeeder image recognition adapter."""
-    
+
+    # Image decoding works from an in-memory buffer, so uploads never
+    # need to hit disk
+    requires_path = False
+
     def __init__(self, settings: ImageRecognitionSettings):
         super().__init__(settings)
         
@@ -109,9 +241,70 @@ class ImageRecognizer(BaseRecognizer):
             model_path=settings.whosat_model_path,
             config_path=settings.whosat_config_path
         )
-        
+
+        # Frozen lookup set: the settings list is O(n) to scan and never
+        # changes after init
+        self._allowed_images = frozenset(
+            x.lower().lstrip('.') for x in settings.allowed_image_types
+        )
+
+        # Duplicate frames skip inference entirely on a cache hit
+        self._predictions = PredictionCache(
+            max_entries=settings.prediction_cache_size,
+            ttl_seconds=settings.prediction_cache_ttl
+        )
+
         logger.info("ImageRecognizer initialized")
-    
+
+    def _cache_key(self, image_source) -> Optional[tuple]:
+        """Build the prediction-cache key for an in-memory image source.
+
+        Hashes the buffer in READ_CHUNK_SIZE pieces (spooled uploads may
+        live on disk) and restores the read position. Path sources return
+        None and bypass the cache.
+        """
+        if not hasattr(image_source, "read"):
+            return None
+        digest = hashlib.blake2b(digest_size=16)
+        pos = image_source.tell()
+        image_source.seek(0)
+        while chunk := image_source.read(self.READ_CHUNK_SIZE):
+            digest.update(chunk)
+        image_source.seek(pos)
+        return (
+            digest.hexdigest(),
+            self.model.MODEL_VERSION,
+            self.min_confidence
+        )
+
+    def recognize_batch(self, image_sources: List) -> List[List[Detection]]:
+        """
+        Recognize species across a batch of images in one invocation.
+
+        This is the seam the micro-batching service layer calls into: a
+        real model would stack the images here and run a single forward
+        pass; the mock processes them in a loop. Sources whose content
+        hash is already cached skip the model call.
+
+        Args:
+            image_sources: Image paths or in-memory buffers
+
+        Returns:
+            One detection list per input source, in order
+        """
+        results: List[Optional[List[Detection]]] = []
+        for source in image_sources:
+            key = self._cache_key(source)
+            detections = self._predictions.get(key) if key is not None else None
+            if detections is None:
+                detections = self.model.recognize(source)
+                if key is not None:
+                    self._predictions.put(key, detections)
+            elif logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Prediction cache hit: %s", key[0])
+            results.append(detections)
+        return results
+
     async def recognize_from_url(self, url: str) -> List[Detection]:
         """
         Recognize species from image URL.
@@ -122,12 +315,16 @@ class ImageRecognizer(BaseRecognizer):
         Returns:
             List of detections
         """
-        # TODO: Download image file from URL
-        # For now, simulate processing
-        logger.warning(f"URL recognition not fully implemented: {url}")
-        
-        # Mock detection based on URL
-        return self.model.recognize(Path("mock_image.jpg"))
+        try:
+            data = await self.fetch_url(url)
+        except httpx.HTTPError as e:
+            logger.warning("Failed to fetch image URL %s: %s", url, e)
+            raise ValueError(f"Could not fetch image URL: {url}")
+
+        # Route through recognize_batch so repeated URL fetches hit the
+        # prediction cache
+        results = await self.run_inference(self.recognize_batch, [io.BytesIO(data)])
+        return results[0]
     
     async def recognize_from_file(self, file_data: BinaryIO, filename: str) -> List[Detection]:
         """
@@ -140,25 +337,19 @@ class ImageRecognizer(BaseRecognizer):
         Returns:
             List of detections
         """
-        temp_path = None
-        try:
-            # Save to temporary file
-            temp_path = self.save_temp_file(file_data, filename)
-            
-            # Validate image format
-            if not self._is_valid_image_file(temp_path):
-                raise ValueError(f"Unsupported image format: {filename}")
-            
-            # Run recognition
-            detections = self.model.recognize(temp_path)
-            
-            return detections
-            
-        finally:
-            if temp_path:
-                self.cleanup_temp_file(temp_path)
+        # Validate image format
+        if not self._is_valid_image_file(Path(filename)):
+            raise ValueError(f"Unsupported image format: {filename}")
+
+        # Buffer in memory (size cap enforced mid-stream) and hand the
+        # buffer straight to the model — no temp-file round trip
+        buffer = self.read_upload(file_data, max_bytes=self.settings.max_file_size)
+        results = await self.run_inference(self.recognize_batch, [buffer])
+        return results[0]
     
     def _is_valid_image_file(self, file_path: Path) -> bool:
         """Check if file is a valid image format."""
-        suffix = file_path.suffix.lower().lstrip('.')
-        return suffix in self.settings.allowed_image_types
\ No newline at end of file
+        # rpartition does the suffix split in one pass; Path.suffix plus
+        # lstrip would build two extra temporaries per call
+        suffix = file_path.name.rpartition('.')[2].lower()
+        return suffix in self._allowed_images
\ No newline at end of file
@@ -3,12 +3,24 @@ Image Recognition Service API
 
 FastAPI service for image-based bird recognition using WhosAtMyFeeder.
 """
+import asyncio
 import logging
-from typing import Optional
-from fastapi import FastAPI, File, UploadFile, HTTPException, Form
+from pathlib import Path
+from typing import BinaryIO, List, Optional, Tuple
+from fastapi import FastAPI, File, UploadFile, HTTPException, Form, Query
+from fastapi.responses import JSONResponse
 
-from ..shared.schemas import RecognitionEvent, RecognitionRequest
-from ..shared.config import ImageRecognitionSettings
+try:
+    # orjson serializes responses in C; fall back to stdlib json without it
+    import orjson  # noqa: F401 — required by ORJSONResponse at runtime
+    from fastapi.responses import ORJSONResponse as _DefaultResponseClass
+except ImportError:
+    _DefaultResponseClass = JSONResponse
+
+from ..shared.schemas import Detection, RecognitionEvent, RecognitionRequest
+from ..shared.base import FileTooLargeError, read_upload_async
+from ..shared.streaming import maybe_stream_event
+from ..shared.config import ImageRecognitionSettings, get_image_settings
 from .recognizer import ImageRecognizer
 
 # Configure logging
@@ -16,17 +28,136 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Initialize settings and recognizer
-settings = ImageRecognitionSettings()
+settings = get_image_settings()
 recognizer = ImageRecognizer(settings)
 
+
+class InferenceBatcher:
+    """Coalesces concurrent uploads into batched recognizer calls.
+
+    Requests arriving within max_batch_delay_ms of each other are
+    drained into one recognize_batch invocation (up to max_batch_size),
+    amortizing per-invocation model overhead across the batch. Each
+    caller awaits a future resolved with its own detection list.
+    """
+
+    def __init__(
+        self,
+        recognizer: ImageRecognizer,
+        max_batch_size: int,
+        max_batch_delay_ms: int
+    ):
+        self.recognizer = recognizer
+        self.max_batch_size = max_batch_size
+        self.max_batch_delay = max_batch_delay_ms / 1000.0
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._worker_task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Start the background batch worker."""
+        if self._worker_task is None:
+            self._worker_task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the background batch worker."""
+        task = self._worker_task
+        self._worker_task = None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def recognize_upload(self, file: UploadFile) -> List[Detection]:
+        """Stream an upload into a buffer and run it through the next batch."""
+        if not self.recognizer._is_valid_image_file(Path(file.filename)):
+            raise ValueError(f"Unsupported image format: {file.filename}")
+
+        # Cooperative chunked read (size cap enforced mid-stream);
+        # image models decode from the buffer, so the upload never
+        # needs its own temp file
+        buffer = await read_upload_async(
+            file, max_bytes=settings.max_file_size,
+            chunk_size=self.recognizer.READ_CHUNK_SIZE
+        )
+
+        if self._worker_task is None:
+            # No loop-bound worker (e.g. direct calls in tests); fall
+            # back to an unbatched invocation
+            return self.recognizer.recognize_batch([buffer])[0]
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((buffer, future))
+        return await future
+
+    async def _run(self):
+        """Drain uploads into batches and fan results back out."""
+        while True:
+            # Block for the first item, then give the rest of the batch
+            # at most max_batch_delay to show up
+            source, future = await self._queue.get()
+            batch: List[Tuple[BinaryIO, asyncio.Future]] = [(source, future)]
+            deadline = asyncio.get_running_loop().time() + self.max_batch_delay
+
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - asyncio.get_running_loop().time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(
+                        await asyncio.wait_for(self._queue.get(), timeout=remaining)
+                    )
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                # Inference runs on the bounded threadpool, so the next
+                # batch can accumulate while this one is being scored
+                results = await self.recognizer.run_inference(
+                    self.recognizer.recognize_batch, [src for src, _ in batch]
+                )
+            except Exception as e:
+                for _, fut in batch:
+                    if not fut.done():
+                        fut.set_exception(e)
+                continue
+
+            if len(batch) > 1:
+                logger.info("Batched %d recognition requests", len(batch))
+            for (_, fut), detections in zip(batch, results):
+                if not fut.done():
+                    fut.set_result(detections)
+
+
+batcher = InferenceBatcher(
+    recognizer,
+    max_batch_size=settings.max_batch_size,
+    max_batch_delay_ms=settings.max_batch_delay_ms
+)
+
 # FastAPI app
 app = FastAPI(
     title="Birds with Friends - Image Recognition Service",
     description="WhosAtMyFeeder adapter for image-based bird species recognition",
-    version="0.1.0"
+    version="0.1.0",
+    default_response_class=_DefaultResponseClass
 )
 
 
+@app.on_event("startup")
+async def startup_event():
+    """Start the inference batch worker."""
+    await batcher.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the inference batch worker and release the HTTP client."""
+    await batcher.stop()
+    await recognizer.aclose()
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
@@ -42,7 +173,8 @@ async def health_check():
 @app.post("/recognize", response_model=RecognitionEvent)
 async def recognize_image(
     file: Optional[UploadFile] = File(None),
-    url: Optional[str] = Form(None)
+    url: Optional[str] = Form(None),
+    stream: bool = Query(False)
 ):
     """
     Recognize bird species from image input.
@@ -50,6 +182,7 @@ async def recognize_image(
     Args:
         file: Uploaded image file (JPG, PNG, BMP)
         url: URL to image file
+        stream: Stream the response incrementally for large events
         
     Returns:
         RecognitionEvent with detections, bounding boxes, and character instances
@@ -72,15 +205,10 @@ async def recognize_image(
         snapshot_url = None
         
         if file:
-            # Validate file size
-            if file.size > settings.max_file_size:
-                raise HTTPException(
-                    status_code=413,
-                    detail=f"File too large. Maximum size: {settings.max_file_size} bytes"
-                )
-            
-            # Process uploaded file
-            detections = await recognizer.recognize_from_file(file.file, file.filename)
+            # Process uploaded file through the inference batcher; size
+            # is enforced while buffering rather than trusting the
+            # client-reported length (see FileTooLargeError below)
+            detections = await batcher.recognize_upload(file)
             snapshot_url = f"uploaded://{file.filename}"
             
         elif url:
@@ -96,9 +224,14 @@ async def recognize_image(
         )
         
         logger.info(f"Recognition complete: {len(detections)} detections, {len(event.characters)} characters")
+
+        # Large flocks can opt into incremental serialization
+        return maybe_stream_event(event, stream)
         
-        return event
-        
+    except FileTooLargeError as e:
+        logger.warning(f"Upload rejected: {e}")
+        raise HTTPException(status_code=413, detail=str(e))
+
     except ValueError as e:
         logger.error(f"Validation error: {e}")
         raise HTTPException(status_code=400, detail=str(e))
@@ -119,7 +252,7 @@ async def root():
             "health": "/health",
             "recognize": "/recognize"
         },
-        "supported_formats": settings.allowed_image_types,
+        "supported_formats": sorted(settings.allowed_image_types),
         "max_file_size": settings.max_file_size,
         "min_confidence": settings.min_confidence
     }
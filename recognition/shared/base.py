@@ -1,23 +1,245 @@
 """
 Base classes for recognition adapters.
 """
+import asyncio
+import io
+import queue
 import tempfile
+import threading
+import time
 import os
 from abc import ABC, abstractmethod
-from datetime import datetime
-from typing import List, Union, BinaryIO
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+
+import httpx
+from typing import Dict, List, Tuple, Union, BinaryIO
 from pathlib import Path
 
 from .schemas import RecognitionEvent, Detection
 from .config import RecognitionSettings
 
 
+class FileTooLargeError(ValueError):
+    """Raised when an upload exceeds the configured size cap mid-stream."""
+
+
+# (epoch second, formatted prefix) reused by iso_utc_now within a second
+_ISO_SECOND: Tuple[int, str] = (0, "")
+
+
+def iso_utc_now() -> str:
+    """
+    Current UTC time as an ISO-8601 string with a Z suffix.
+
+    Byte-equivalent to datetime.utcnow().isoformat() + "Z" but built
+    from a single time_ns() clock read: no datetime object, and the
+    per-second prefix is formatted once then reused for every event
+    stamped within that second. Races on the cache are benign — the
+    loser just reformats the same prefix.
+    """
+    global _ISO_SECOND
+    seconds, rem = divmod(time.time_ns(), 1_000_000_000)
+    cached_seconds, prefix = _ISO_SECOND
+    if seconds != cached_seconds:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds))
+        _ISO_SECOND = (seconds, prefix)
+    return f"{prefix}.{rem // 1000:06d}Z"
+
+
+async def read_upload_async(file, max_bytes: int = None,
+                            chunk_size: int = 64 * 1024) -> tempfile.SpooledTemporaryFile:
+    """
+    Stream a FastAPI UploadFile into a spooled buffer.
+
+    Reads cooperatively in chunks so a large upload doesn't block the
+    event loop the way one big read() would, enforcing max_bytes as the
+    total grows. Small uploads stay in memory; big ones spill to disk
+    through the spool.
+
+    Args:
+        file: UploadFile (anything with an async read(n))
+        max_bytes: Optional size cap; exceeding it raises FileTooLargeError
+        chunk_size: Bytes per cooperative read
+
+    Returns:
+        Rewound spooled file with the upload contents
+    """
+    out = tempfile.SpooledTemporaryFile(max_size=chunk_size * 16)
+    total = 0
+    try:
+        while chunk := await file.read(chunk_size):
+            total += len(chunk)
+            if max_bytes is not None and total > max_bytes:
+                raise FileTooLargeError(
+                    f"File too large. Maximum size: {max_bytes} bytes"
+                )
+            out.write(chunk)
+    except FileTooLargeError:
+        out.close()
+        raise
+    out.seek(0)
+    return out
+
+
+class BufferPool:
+    """LIFO free-list of reusable read buffers.
+
+    The streaming copy helpers need a scratch chunk buffer per call;
+    recycling them through a small pool spares the allocator a fresh
+    bytearray per upload, and LIFO reuse keeps the hottest buffer warm
+    in cache.
+    """
+
+    def __init__(self, buffer_size: int, max_buffers: int = 8):
+        self.buffer_size = buffer_size
+        self._free: queue.LifoQueue = queue.LifoQueue(maxsize=max_buffers)
+
+    def acquire(self) -> bytearray:
+        """Hand out a free buffer, allocating one if the pool is empty."""
+        try:
+            return self._free.get_nowait()
+        except queue.Empty:
+            return bytearray(self.buffer_size)
+
+    def release(self, buf: bytearray):
+        """Return a buffer to the pool; drop it if the pool is full."""
+        try:
+            self._free.put_nowait(buf)
+        except queue.Full:
+            pass
+
+
+class TempPathPool:
+    """Small pool of reusable temp file paths, keyed by suffix.
+
+    Creating and unlinking a fresh temp file per upload churns inodes
+    under bursty load; recycled paths are truncated on release and
+    handed back out, so steady-state uploads reuse the same few files.
+    """
+
+    def __init__(self, max_per_suffix: int = 8):
+        self.max_per_suffix = max_per_suffix
+        self._free: Dict[str, List[Path]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, suffix: str) -> Path:
+        """Hand out a free path for this suffix, creating one if needed."""
+        with self._lock:
+            free = self._free.get(suffix)
+            if free:
+                return free.pop()
+        fd, name = tempfile.mkstemp(suffix=suffix)
+        os.close(fd)
+        return Path(name)
+
+    def release(self, path: Path):
+        """Return a path to the pool, or unlink it if the pool is full."""
+        try:
+            os.truncate(path, 0)
+        except OSError:
+            return  # Path vanished or is unusable; drop it
+        with self._lock:
+            free = self._free.setdefault(path.suffix, [])
+            if len(free) < self.max_per_suffix:
+                free.append(path)
+                return
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
 class BaseRecognizer(ABC):
     """Abstract base class for recognition adapters."""
-    
+
+    # Chunk size for streaming uploads into temp files
+    READ_CHUNK_SIZE = 64 * 1024
+
+    # Scratch buffers shared by all recognizers in the process
+    _read_buffers = BufferPool(READ_CHUNK_SIZE)
+
+    # Whether the underlying model needs a real filesystem path. Some
+    # decoders (notably audio) only take paths; models that decode from
+    # a buffer should flip this off and use read_upload, skipping the
+    # write/stat/truncate round trip per request.
+    requires_path = True
+
     def __init__(self, settings: RecognitionSettings):
         self.settings = settings
         self.min_confidence = settings.min_confidence
+        self._temp_paths = TempPathPool()
+        # Bounded pool for blocking model calls; keeps inference off the
+        # event loop while capping how many run at once
+        self._executor = ThreadPoolExecutor(
+            max_workers=settings.inference_workers,
+            thread_name_prefix="inference"
+        )
+        # Shared keep-alive HTTP client for media downloads; created on
+        # first use so it binds to the serving event loop
+        self._http: "httpx.AsyncClient" = None
+
+    def _http_client(self) -> httpx.AsyncClient:
+        """The pooled HTTP client, created lazily.
+
+        Keep-alive connections mean repeated fetches from the same
+        feeder host skip the TCP/TLS handshake after the first request.
+        """
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_keepalive_connections=32,
+                    max_connections=64
+                ),
+                timeout=10.0,
+                follow_redirects=True
+            )
+        return self._http
+
+    async def fetch_url(self, url: str) -> bytes:
+        """Download a media URL through the pooled client."""
+        response = await self._http_client().get(url)
+        response.raise_for_status()
+        return response.content
+
+    async def recognize_from_urls(self, urls: List[str]) -> List[List[Detection]]:
+        """
+        Recognize several media URLs concurrently.
+
+        Fetches overlap up to the fetch_concurrency setting, so a batch
+        of snapshots from one host rides the same pooled connections
+        instead of being downloaded one at a time.
+
+        Args:
+            urls: URLs to media files
+
+        Returns:
+            One detection list per URL, in order
+        """
+        semaphore = asyncio.Semaphore(self.settings.fetch_concurrency)
+
+        async def recognize_one(url: str) -> List[Detection]:
+            async with semaphore:
+                return await self.recognize_from_url(url)
+
+        return await asyncio.gather(*(recognize_one(url) for url in urls))
+
+    async def aclose(self):
+        """Release the pooled HTTP client (call from service shutdown)."""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    async def run_inference(self, func, *args):
+        """Run a blocking model call on the bounded inference pool.
+
+        Declared-async recognize paths would otherwise execute the model
+        directly on the event loop, serializing every concurrent request
+        behind each inference.
+        """
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, func, *args
+        )
     
     @abstractmethod
     async def recognize_from_url(self, url: str) -> List[Detection]:
@@ -63,54 +285,120 @@ class BaseRecognizer(ABC):
         Returns:
             RecognitionEvent with characters generated
         """
-        from .schemas import create_characters_from_detection, apply_confidence_threshold
-        
-        # Apply confidence thresholds
-        processed_detections = [
-            apply_confidence_threshold(detection, self.min_confidence)
-            for detection in detections
-        ]
-        
-        # Generate characters for multi-count detections
-        all_characters = []
-        for detection in processed_detections:
-            characters = create_characters_from_detection(detection)
-            all_characters.extend(characters)
+        from .schemas import create_characters_from_detection, apply_confidence_thresholds
+
+        # Apply confidence thresholds (vectorized for large batches)
+        processed_detections = apply_confidence_thresholds(
+            detections, self.min_confidence
+        )
         
+        # Generate characters for multi-count detections; one C-level
+        # flatten instead of a grow-by-extend loop
+        all_characters = list(chain.from_iterable(
+            create_characters_from_detection(detection)
+            for detection in processed_detections
+        ))
+
+
         return RecognitionEvent(
-            timestamp=datetime.utcnow().isoformat() + "Z",
+            timestamp=iso_utc_now(),
             source=source,
             detections=processed_detections,
             characters=all_characters,
             snapshot_url=snapshot_url
         )
     
-    def save_temp_file(self, file_data: BinaryIO, filename: str) -> Path:
+    def save_temp_file(
+        self,
+        file_data: BinaryIO,
+        filename: str,
+        max_bytes: int = None
+    ) -> Path:
         """
         Save uploaded file to temporary location.
-        
+
+        Streams in fixed-size chunks rather than buffering the whole
+        upload, so peak memory stays bounded and oversized uploads are
+        rejected as soon as the cap is crossed. Paths come from the
+        recognizer's TempPathPool and go back to it via
+        cleanup_temp_file.
+
         Args:
             file_data: Binary file data
             filename: Original filename for extension detection
-            
+            max_bytes: Optional size cap; exceeding it raises FileTooLargeError
+
         Returns:
             Path to temporary file
         """
         suffix = Path(filename).suffix
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
-        
+        path = self._temp_paths.acquire(suffix)
+        buf = self._read_buffers.acquire()
+        view = memoryview(buf)
+        total = 0
+
         try:
-            file_data.seek(0)
-            temp_file.write(file_data.read())
-            temp_file.flush()
-            return Path(temp_file.name)
+            with open(path, 'wb') as temp_file:
+                file_data.seek(0)
+                while True:
+                    n = file_data.readinto(buf)
+                    if not n:
+                        break
+                    total += n
+                    if max_bytes is not None and total > max_bytes:
+                        raise FileTooLargeError(
+                            f"File too large. Maximum size: {max_bytes} bytes"
+                        )
+                    temp_file.write(view[:n])
+            return path
+        except FileTooLargeError:
+            self._temp_paths.release(path)
+            raise
         finally:
-            temp_file.close()
+            view.release()
+            self._read_buffers.release(buf)
     
+    def read_upload(self, file_data: BinaryIO, max_bytes: int = None) -> io.BytesIO:
+        """
+        Copy an upload into an in-memory buffer in bounded chunks.
+
+        The in-memory counterpart of save_temp_file, for recognizers
+        whose models decode from a buffer (requires_path False). Applies
+        the same mid-stream size cap.
+
+        Args:
+            file_data: Binary file data
+            max_bytes: Optional size cap; exceeding it raises FileTooLargeError
+
+        Returns:
+            Rewound BytesIO with the upload contents
+        """
+        buf = self._read_buffers.acquire()
+        view = memoryview(buf)
+        out = io.BytesIO()
+        total = 0
+
+        try:
+            file_data.seek(0)
+            while True:
+                n = file_data.readinto(buf)
+                if not n:
+                    break
+                total += n
+                if max_bytes is not None and total > max_bytes:
+                    raise FileTooLargeError(
+                        f"File too large. Maximum size: {max_bytes} bytes"
+                    )
+                out.write(view[:n])
+        finally:
+            view.release()
+            self._read_buffers.release(buf)
+        out.seek(0)
+        return out
+
     def cleanup_temp_file(self, file_path: Path):
-        """Clean up temporary file."""
+        """Return a temporary file's path to the pool for reuse."""
         try:
-            if file_path.exists():
-                os.unlink(file_path)
+            self._temp_paths.release(file_path)
         except Exception:
             pass  # Ignore cleanup errors
\ No newline at end of file
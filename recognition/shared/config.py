@@ -1,6 +1,8 @@
 """
 Base configuration for recognition services.
 """
+from functools import lru_cache
+
 from pydantic_settings import BaseSettings
 from typing import Optional
 
@@ -15,15 +17,24 @@ class RecognitionSettings(BaseSettings):
     host: str = "0.0.0.0"
     debug: bool = True
     
-    # File handling
+    # Inference offload: size of the threadpool that runs blocking
+    # model calls so they don't stall the event loop
+    inference_workers: int = 2
+
+    # Cap on concurrent media downloads in recognize_from_urls
+    fetch_concurrency: int = 8
+
+    # File handling. Frozensets: extension checks are O(1) membership
+    # tests, and the immutable instance is shared rather than copied
     max_file_size: int = 50 * 1024 * 1024  # 50MB
-    allowed_audio_types: list = ["wav", "mp3", "m4a", "flac"]
-    allowed_image_types: list = ["jpg", "jpeg", "png", "bmp"]
+    allowed_audio_types: frozenset = frozenset({"wav", "mp3", "m4a", "flac"})
+    allowed_image_types: frozenset = frozenset({"jpg", "jpeg", "png", "bmp"})
     
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
         extra = "ignore"  # Ignore extra environment variables
+        frozen = True  # Immutable, so the cached instance is safely shared
 
 
 class AudioRecognitionSettings(RecognitionSettings):
@@ -45,4 +56,34 @@ class ImageRecognitionSettings(RecognitionSettings):
     
     # WhosAtMyFeeder specific settings
     whosat_model_path: Optional[str] = None
-    whosat_config_path: Optional[str] = None
\ No newline at end of file
+    whosat_config_path: Optional[str] = None
+
+    # Micro-batching: concurrent uploads arriving within the delay
+    # window share a single model invocation
+    max_batch_size: int = 8
+    max_batch_delay_ms: int = 20
+
+    # Content-addressed prediction cache: duplicate frames skip
+    # inference for up to the TTL
+    prediction_cache_size: int = 256
+    prediction_cache_ttl: float = 300.0  # seconds
+
+
+@lru_cache(maxsize=1)
+def get_audio_settings() -> AudioRecognitionSettings:
+    """Get the audio recognition settings instance.
+
+    Memoized: constructing settings re-reads the environment and .env
+    file, which repeat callers should not pay for.
+    """
+    return AudioRecognitionSettings()
+
+
+@lru_cache(maxsize=1)
+def get_image_settings() -> ImageRecognitionSettings:
+    """Get the image recognition settings instance.
+
+    Memoized like get_audio_settings; tests can cache_clear to re-read
+    the environment.
+    """
+    return ImageRecognitionSettings()
@@ -3,13 +3,28 @@ Shared schemas and utilities for recognition services.
 """
 
 from datetime import datetime
+from functools import lru_cache
 from typing import List, Optional, Literal, Union
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 import re
 
+try:
+    import numpy as np
+except ImportError:  # Optional; thresholding falls back to a plain loop
+    np = None
+
+# Compiled once: re.sub with a string pattern re-checks the module's
+# pattern cache on every call
+_NON_ALNUM = re.compile(r'[^a-zA-Z0-9\s]')
+_WS = re.compile(r'\s+')
+
 
 class BoundingBox(BaseModel):
     """Bounding box coordinates for image detections."""
+    # Never mutated after construction; frozen skips the assignment
+    # machinery entirely and makes boxes hashable
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     x: float = Field(..., description="X coordinate (0-1 normalized)")
     y: float = Field(..., description="Y coordinate (0-1 normalized)")
     width: float = Field(..., description="Width (0-1 normalized)")
@@ -18,6 +33,11 @@ class BoundingBox(BaseModel):
 
 class Detection(BaseModel):
     """Individual species detection."""
+    # Not frozen: thresholding flips low_confidence in place, which is
+    # cheaper than a model_copy per detection; validate_assignment stays
+    # off so that write is a plain setattr
+    model_config = ConfigDict(extra="ignore", validate_assignment=False)
+
     species: str = Field(..., description="Species name (e.g., 'Northern Cardinal')")
     count: int = Field(1, ge=1, description="Number of individuals detected")
     confidence: float = Field(..., ge=0.0, le=1.0, description="Detection confidence score")
@@ -27,12 +47,16 @@ class Detection(BaseModel):
 
 class Character(BaseModel):
     """Individual character instance for storytelling."""
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     id: str = Field(..., description="Unique character identifier")
     species: str = Field(..., description="Species name")
 
 
 class RecognitionEvent(BaseModel):
     """Unified recognition event schema."""
+    model_config = ConfigDict(extra="ignore", validate_assignment=False)
+
     timestamp: str = Field(..., description="ISO 8601 timestamp")
     source: Literal["audio", "image"] = Field(..., description="Recognition source type")
     detections: List[Detection] = Field(..., description="List of species detections")
@@ -46,44 +70,54 @@ class RecognitionRequest(BaseModel):
     # Note: For binary data, we'll handle as form data or multipart upload
 
 
+@lru_cache(maxsize=1024)
+def _clean_species_name(species: str) -> str:
+    """Cached lowercase/underscored form of a species name.
+
+    The handful of species a feeder ever sees repeat constantly, so the
+    regex cleanup runs once per distinct name rather than once per
+    character.
+    """
+    clean_name = _NON_ALNUM.sub('', species.lower())
+    return _WS.sub('_', clean_name.strip())
+
+
 def generate_character_id(species: str, index: int = 1) -> str:
     """
     Generate a unique character ID from species name.
-    
+
     Args:
         species: Species name (e.g., "Northern Cardinal")
         index: Instance number for multiple individuals
-        
+
     Returns:
         Unique character ID (e.g., "northern_cardinal_1")
     """
-    # Convert to lowercase, replace spaces with underscores, remove special chars
-    clean_name = re.sub(r'[^a-zA-Z0-9\s]', '', species.lower())
-    clean_name = re.sub(r'\s+', '_', clean_name.strip())
-    return f"{clean_name}_{index}"
+    return f"{_clean_species_name(species)}_{index}"
 
 
 def create_characters_from_detection(detection: Detection) -> List[Character]:
     """
     Create character instances from a detection based on count.
-    
+
     Args:
         detection: Detection with species and count
-        
+
     Returns:
         List of Character instances
     """
-    characters = []
-    
-    if detection.count > 1:
-        for i in range(1, detection.count + 1):
-            char_id = generate_character_id(detection.species, i)
-            characters.append(Character(
-                id=char_id,
-                species=detection.species
-            ))
-    
-    return characters
+    if detection.count <= 1:
+        return []
+
+    # Clean the name once per detection, not once per individual; the
+    # id/species strings are derived right here, so model_construct
+    # skips revalidating them (cf. the recognizers' trusted factories)
+    clean_name = _clean_species_name(detection.species)
+    species = detection.species
+    return [
+        Character.model_construct(id=f"{clean_name}_{i}", species=species)
+        for i in range(1, detection.count + 1)
+    ]
 
 
 def apply_confidence_threshold(detection: Detection, min_confidence: float) -> Detection:
@@ -98,4 +132,41 @@ def apply_confidence_threshold(detection: Detection, min_confidence: float) -> D
         Detection with low_confidence flag set
     """
     detection.low_confidence = detection.confidence < min_confidence
-    return detection
\ No newline at end of file
+    return detection
+
+
+# Below this many detections the array round trip costs more than the
+# Python loop it replaces
+_VECTOR_THRESHOLD = 8
+
+
+def apply_confidence_thresholds(
+    detections: List[Detection], min_confidence: float
+) -> List[Detection]:
+    """
+    Set the low_confidence flag across a batch of detections in place.
+
+    Large batches extract confidences into one array and compare them in
+    a single vectorized operation instead of dispatching a comparison
+    per detection; small batches (and trees without numpy) take the
+    plain loop.
+
+    Args:
+        detections: Detections to evaluate
+        min_confidence: Minimum confidence threshold
+
+    Returns:
+        The same list, with low_confidence flags set
+    """
+    if np is not None and len(detections) >= _VECTOR_THRESHOLD:
+        conf = np.fromiter(
+            (d.confidence for d in detections),
+            dtype=np.float64,
+            count=len(detections)
+        )
+        for detection, flag in zip(detections, (conf < min_confidence).tolist()):
+            detection.low_confidence = flag
+    else:
+        for detection in detections:
+            detection.low_confidence = detection.confidence < min_confidence
+    return detections
\ No newline at end of file
@@ -0,0 +1,51 @@
+"""
+Incremental serialization for large recognition events.
+"""
+import json
+
+from fastapi.responses import StreamingResponse
+
+try:
+    import orjson
+except ImportError:  # Optional; streaming falls back to stdlib json
+    orjson = None
+
+from .schemas import RecognitionEvent
+
+# Below this many characters a one-shot response is cheaper than the
+# chunking overhead
+STREAM_CHARACTER_THRESHOLD = 64
+
+
+def _dumps(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+def event_byte_stream(event: RecognitionEvent):
+    """Yield an event as JSON bytes, one character entry at a time.
+
+    The scalar fields and detections go out in the first chunk, then
+    each character is serialized on its own, so first-byte latency and
+    peak buffer size stay flat no matter how large a flock gets.
+    """
+    head = event.model_dump(exclude={"characters"})
+    yield _dumps(head)[:-1] + b',"characters":['
+    for i, character in enumerate(event.characters):
+        yield (b"," if i else b"") + _dumps(character.model_dump())
+    yield b"]}"
+
+
+def maybe_stream_event(event: RecognitionEvent, stream: bool):
+    """Return the event as-is, or a StreamingResponse when it's big.
+
+    Streaming only kicks in when the caller opted in with stream=true
+    AND the character list is over STREAM_CHARACTER_THRESHOLD; small
+    events keep the regular serialized response.
+    """
+    if not stream or len(event.characters) <= STREAM_CHARACTER_THRESHOLD:
+        return event
+    return StreamingResponse(
+        event_byte_stream(event), media_type="application/json"
+    )
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Bake data/archetype_mapping.yaml into aggregator/_archetype_data.py.
+
+Importing a generated Python module is far faster than parsing YAML at
+runtime (dict literals come straight out of the .pyc), so the default
+archetype mapping ships pre-baked. Re-run this script whenever the YAML
+changes:
+
+    python scripts/bake_archetypes.py
+"""
+import pprint
+import sys
+from pathlib import Path
+
+import yaml
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+MAPPING_YAML = PROJECT_ROOT / "data" / "archetype_mapping.yaml"
+OUTPUT_MODULE = PROJECT_ROOT / "aggregator" / "_archetype_data.py"
+
+HEADER = '''"""
+Baked archetype mapping data.
+
+AUTO-GENERATED by scripts/bake_archetypes.py from
+data/archetype_mapping.yaml -- do not edit by hand.
+"""
+'''
+
+
+def main() -> int:
+    if not MAPPING_YAML.exists():
+        print(f"Mapping file not found: {MAPPING_YAML}", file=sys.stderr)
+        return 1
+
+    with open(MAPPING_YAML, "r", encoding="utf-8") as f:
+        data = yaml.safe_load(f)
+
+    species = data.get("species_archetypes", {})
+    descriptions = data.get("archetype_descriptions", {})
+
+    with open(OUTPUT_MODULE, "w", encoding="utf-8") as f:
+        f.write(HEADER)
+        f.write("\nSPECIES_ARCHETYPES = ")
+        f.write(pprint.pformat(species, sort_dicts=True))
+        f.write("\n\nARCHETYPE_DESCRIPTIONS = ")
+        f.write(pprint.pformat(descriptions, sort_dicts=True))
+        f.write("\n")
+
+    print(f"Wrote {len(species)} species mappings to {OUTPUT_MODULE}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
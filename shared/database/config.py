@@ -4,13 +4,28 @@ Database configuration and session management for Birds with Friends.
 Unified database setup that all services can import and use.
 """
 import os
-from sqlalchemy import create_engine, MetaData
+from sqlalchemy import create_engine, event, MetaData
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 from pydantic import ConfigDict
 from pydantic_settings import BaseSettings
 
+try:
+    import orjson
+except ImportError:  # Optional; JSON columns fall back to stdlib json
+    orjson = None
+
+if orjson is not None:
+    # orjson (de)serializes the JSON columns in C, several times faster
+    # than the stdlib default on the big event/preferences payloads
+    _json_engine_kwargs = {
+        "json_serializer": lambda obj: orjson.dumps(obj).decode(),
+        "json_deserializer": orjson.loads,
+    }
+else:
+    _json_engine_kwargs = {}
+
 
 class DatabaseSettings(BaseSettings):
     """Database configuration settings."""
@@ -30,20 +45,47 @@ db_settings = DatabaseSettings()
 
 # Create engine
 if db_settings.database_url.startswith("sqlite"):
-    # SQLite configuration with thread safety
+    # SQLite configuration with thread safety. File-backed databases use
+    # the default QueuePool so WAL readers can run in parallel across
+    # threads; in-memory databases must share one connection.
+    if ":memory:" in db_settings.database_url or db_settings.database_url in ("sqlite://", "sqlite:///"):
+        sqlite_pool_kwargs = {"poolclass": StaticPool}
+    else:
+        sqlite_pool_kwargs = {"pool_pre_ping": True}
+
     engine = create_engine(
         db_settings.database_url,
         echo=db_settings.echo,
-        poolclass=StaticPool,
+        query_cache_size=1200,
         connect_args={
             "check_same_thread": False,
         },
+        **sqlite_pool_kwargs,
+        **_json_engine_kwargs,
     )
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        # WAL + synchronous=NORMAL keep commits durable enough for this
+        # workload while avoiding an fsync per transaction
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
 else:
-    # PostgreSQL configuration
+    # PostgreSQL configuration with a sized, health-checked pool so
+    # concurrent requests reuse connections instead of re-handshaking
     engine = create_engine(
         db_settings.database_url,
         echo=db_settings.echo,
+        query_cache_size=1200,
+        pool_size=20,
+        max_overflow=10,
+        pool_timeout=30,
+        pool_pre_ping=True,
+        pool_recycle=3600,
+        **_json_engine_kwargs,
     )
 
 # Create session factory
@@ -4,9 +4,9 @@ CRUD operations for Birds with Friends database models.
 Provides basic Create, Read, Update, Delete operations for all tables.
 """
 from typing import List, Optional, Dict, Any
-from datetime import datetime
+from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc
+from sqlalchemy import and_, or_, desc, func
 
 from .models import User, RecognitionEvent, Snapshot, Character, Story, Episode, Notification
 from .config import get_session
@@ -25,6 +25,23 @@ class BaseCRUD:
         db.commit()
         db.refresh(obj)
         return obj
+
+    def create_many(self, db: Session, rows: List[Dict[str, Any]]) -> int:
+        """Create many records with a single flush and commit.
+
+        One transaction (and one WAL fsync) for the whole batch instead
+        of a commit per row; use this when an event produces dozens of
+        rows at once. Rows are plain column dicts and are not echoed
+        back as ORM objects.
+
+        Returns:
+            Number of rows inserted
+        """
+        if not rows:
+            return 0
+        db.bulk_insert_mappings(self.model, rows)
+        db.commit()
+        return len(rows)
     
     def get(self, db: Session, id: Any) -> Optional[Any]:
         """Get record by ID."""
@@ -33,6 +50,32 @@ class BaseCRUD:
     def get_multi(self, db: Session, skip: int = 0, limit: int = 100) -> List[Any]:
         """Get multiple records with pagination."""
         return db.query(self.model).offset(skip).limit(limit).all()
+
+    def get_page(self, db: Session, cursor: datetime = None, limit: int = 100) -> List[Any]:
+        """Get a page of records by keyset, newest first.
+
+        Pass the created_at of the last row from the previous page as
+        the cursor; unlike OFFSET paging the cost stays flat no matter
+        how deep the caller scrolls. Only meaningful for models with a
+        created_at column.
+
+        Args:
+            cursor: Fetch rows strictly older than this; None starts
+                from the newest
+            limit: Page size
+        """
+        query = db.query(self.model)
+        if cursor is not None:
+            query = query.filter(self.model.created_at < cursor)
+        return query.order_by(desc(self.model.created_at)).limit(limit).all()
+
+    def iter_all(self, db: Session, chunk_size: int = 500):
+        """Iterate over every record without materializing the table.
+
+        Streams rows from the database chunk_size at a time via
+        yield_per, keeping memory at O(chunk) for exports and sweeps.
+        """
+        yield from db.query(self.model).yield_per(chunk_size)
     
     def update(self, db: Session, id: Any, **kwargs) -> Optional[Any]:
         """Update record by ID."""
@@ -88,10 +131,21 @@ class RecognitionEventCRUD(BaseCRUD):
     def create_event(self, db: Session, payload: Dict[str, Any]) -> RecognitionEvent:
         """Create a new recognition event."""
         return self.create(db, payload_json=payload)
+
+    def create_events(self, db: Session, payloads: List[Dict[str, Any]]) -> int:
+        """Create a batch of recognition events in one commit.
+
+        The recognizers produce events in bursts; routing them through
+        create_many inserts the whole batch with one executemany and
+        one transaction instead of an add/flush per event.
+        """
+        return self.create_many(db, [{"payload_json": p} for p in payloads])
     
     def get_recent(self, db: Session, hours: int = 24, limit: int = 100) -> List[RecognitionEvent]:
-        """Get recent recognition events."""
-        cutoff = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+        """Get recognition events from the last `hours` hours."""
+        # A true rolling window; the old midnight-of-today cutoff
+        # ignored the hours argument entirely
+        cutoff = datetime.utcnow() - timedelta(hours=hours)
         return (db.query(RecognitionEvent)
                 .filter(RecognitionEvent.created_at >= cutoff)
                 .order_by(desc(RecognitionEvent.created_at))
@@ -115,6 +169,14 @@ class SnapshotCRUD(BaseCRUD):
             source_event_id=source_event_id
         )
     
+    def create_snapshots(self, db: Session, snapshots: List[Dict[str, Any]]) -> int:
+        """Create a batch of snapshots in one commit.
+
+        Bulk counterpart to create_snapshot for capture bursts; rows
+        are column dicts (id, url, source_event_id).
+        """
+        return self.create_many(db, snapshots)
+
     def get_by_event(self, db: Session, event_id: int) -> List[Snapshot]:
         """Get snapshots for a specific recognition event."""
         return db.query(Snapshot).filter(Snapshot.source_event_id == event_id).all()
@@ -137,6 +199,15 @@ class CharacterCRUD(BaseCRUD):
             placeholder_bool=placeholder
         )
     
+    def create_characters(self, db: Session, characters: List[Dict[str, Any]]) -> int:
+        """Create a batch of characters in one commit.
+
+        A recognition event can produce many characters at once; this
+        routes them through create_many so the event costs one
+        transaction instead of one per character.
+        """
+        return self.create_many(db, characters)
+
     def get_by_species(self, db: Session, species: str) -> List[Character]:
         """Get all characters of a specific species."""
         return db.query(Character).filter(Character.species == species).all()
@@ -147,7 +218,9 @@ class CharacterCRUD(BaseCRUD):
     
     def update_last_seen(self, db: Session, id: str) -> Optional[Character]:
         """Update character's last seen timestamp."""
-        return self.update(db, id, last_seen=datetime.utcnow())
+        # Server-side now(): the database stamps the row, skipping a
+        # Python datetime construction per touch
+        return self.update(db, id, last_seen=func.now())
 
 
 class StoryCRUD(BaseCRUD):
@@ -214,7 +287,7 @@ class EpisodeCRUD(BaseCRUD):
             db, 
             id, 
             status="published",
-            published_at=datetime.utcnow()
+            published_at=func.now()
         )
 
 
@@ -244,7 +317,7 @@ class NotificationCRUD(BaseCRUD):
     
     def update_last_sent(self, db: Session, id: int) -> Optional[Notification]:
         """Update last sent timestamp."""
-        return self.update(db, id, last_sent_at=datetime.utcnow())
+        return self.update(db, id, last_sent_at=func.now())
 
 
 # Global CRUD instances
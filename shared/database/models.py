@@ -12,12 +12,17 @@ Contains all database table definitions according to Feature 9 specification:
 """
 from datetime import datetime, timezone
 from typing import Optional
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, JSON, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, JSON, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
 from .config import Base
 
+# JSONB on Postgres stores a pre-parsed binary form (no re-parse per
+# access); SQLite and others keep the plain JSON type
+JSONVariant = JSON().with_variant(JSONB, "postgresql")
+
 
 # Core User Management
 
@@ -31,12 +36,12 @@ class User(Base):
     email = Column(String(255), nullable=True, index=True)
     phone = Column(String(20), nullable=True)
     timezone = Column(String(50), default="UTC", nullable=False)
-    preferences_json = Column(JSON, nullable=True)  # User preferences as JSON
-    created_at = Column(DateTime, default=func.now(), nullable=False)
+    preferences_json = Column(JSONVariant, nullable=True)  # User preferences as JSON
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
     
     # Relationships
-    stories = relationship("Story", back_populates="user", cascade="all, delete-orphan")
-    notifications = relationship("Notification", back_populates="user", cascade="all, delete-orphan")
+    stories = relationship("Story", back_populates="user", cascade="all, delete-orphan", lazy="selectin")
+    notifications = relationship("Notification", back_populates="user", cascade="all, delete-orphan", lazy="selectin")
     
     def __repr__(self):
         return f"<User(id='{self.id}', email='{self.email}')>"
@@ -51,11 +56,16 @@ class RecognitionEvent(Base):
     
     # Primary fields as specified
     id = Column(Integer, primary_key=True, autoincrement=True)
-    payload_json = Column(JSON, nullable=False)  # Complete recognition data
-    created_at = Column(DateTime, default=func.now(), nullable=False)
-    
+    payload_json = Column(JSONVariant, nullable=False)  # Complete recognition data
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+
+    # Descending index backs the recency range scans in get_recent
+    __table_args__ = (
+        Index("ix_recognition_events_created_at", created_at.desc()),
+    )
+
     # Relationships
-    snapshots = relationship("Snapshot", back_populates="source_event", cascade="all, delete-orphan")
+    snapshots = relationship("Snapshot", back_populates="source_event", cascade="all, delete-orphan", lazy="selectin")
     
     def __repr__(self):
         return f"<RecognitionEvent(id={self.id}, created_at='{self.created_at}')>"
@@ -69,7 +79,7 @@ class Snapshot(Base):
     # Primary fields as specified
     id = Column(String, primary_key=True)  # UUID or filename-based ID
     url = Column(String(500), nullable=False)  # File path or S3 URL
-    timestamp = Column(DateTime, default=func.now(), nullable=False)
+    timestamp = Column(DateTime, server_default=func.now(), nullable=False)
     source_event_id = Column(Integer, ForeignKey("recognition_events.id"), nullable=True)
     
     # Relationships
@@ -90,8 +100,8 @@ class Character(Base):
     id = Column(String, primary_key=True)  # e.g., "northern_cardinal_1"
     species = Column(String, nullable=False)
     archetype = Column(String, nullable=True)  # Personality archetype
-    first_seen = Column(DateTime, default=func.now(), nullable=False)
-    last_seen = Column(DateTime, default=func.now(), nullable=False)
+    first_seen = Column(DateTime, server_default=func.now(), nullable=False)
+    last_seen = Column(DateTime, server_default=func.now(), nullable=False)
     placeholder_bool = Column(Boolean, default=False, nullable=False)  # Is this a placeholder?
     
     def __repr__(self):
@@ -113,11 +123,11 @@ class Story(Base):
     start_date = Column(DateTime, nullable=True)  # When story starts
     release_frequency = Column(String(20), default="daily")  # daily, weekly, custom
     status = Column(String(20), default="draft")  # draft, scheduled, published, completed
-    created_at = Column(DateTime, default=func.now(), nullable=False)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
     
     # Relationships
     user = relationship("User", back_populates="stories")
-    episodes = relationship("Episode", back_populates="story", cascade="all, delete-orphan")
+    episodes = relationship("Episode", back_populates="story", cascade="all, delete-orphan", lazy="selectin")
     notifications = relationship("Notification", back_populates="story", cascade="all, delete-orphan")
     
     def __repr__(self):
@@ -155,14 +165,19 @@ class Notification(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True)
     channel = Column(String(20), nullable=False)  # email, webpush, sms
-    subscription_json = Column(JSON, nullable=True)  # Channel-specific subscription data
+    subscription_json = Column(JSONVariant, nullable=True)  # Channel-specific subscription data
     last_sent_at = Column(DateTime, nullable=True)  # Last successful send
     
     # Additional useful fields
     story_id = Column(String, ForeignKey("stories.id"), nullable=True, index=True)
     status = Column(String(20), default="active")  # active, paused, failed
-    created_at = Column(DateTime, default=func.now(), nullable=False)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
     
+    # Active-subscription lookups filter on user and status together
+    __table_args__ = (
+        Index("ix_notifications_user_status", "user_id", "status"),
+    )
+
     # Relationships
     user = relationship("User", back_populates="notifications")
     story = relationship("Story", back_populates="notifications")
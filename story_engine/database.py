@@ -5,7 +5,8 @@ SQLAlchemy models for storing stories, episodes, and generation metadata.
 """
 from datetime import datetime, timezone
 from typing import Optional
-from sqlalchemy import Column, Integer, String, Text, DateTime, Float, Boolean, JSON, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, Float, Boolean, JSON, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -14,6 +15,10 @@ from .models import EpisodeStatus
 
 Base = declarative_base()
 
+# JSONB on Postgres stores a pre-parsed binary form (no re-parse per
+# access); SQLite and others keep the plain JSON type
+JSONVariant = JSON().with_variant(JSONB, "postgresql")
+
 
 class Story(Base):
     """Main story record with metadata."""
@@ -43,14 +48,14 @@ class Story(Base):
     is_serialized = Column(Boolean, default=False)  # True if episodes release over time
     
     # Timestamps
-    created_at = Column(DateTime, default=func.now(), nullable=False)
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
     
     # Story context (JSON storage)
-    characters_data = Column(JSON, nullable=True)    # Character information used
-    species_data = Column(JSON, nullable=True)       # Species counts used
-    user_preferences = Column(JSON, nullable=True)   # User preferences used
-    time_range = Column(JSON, nullable=True)         # Time range data came from
+    characters_data = Column(JSONVariant, nullable=True)    # Character information used
+    species_data = Column(JSONVariant, nullable=True)       # Species counts used
+    user_preferences = Column(JSONVariant, nullable=True)   # User preferences used
+    time_range = Column(JSONVariant, nullable=True)         # Time range data came from
     
     # Generation metadata
     template_used = Column(String(100), nullable=True)
@@ -62,8 +67,20 @@ class Story(Base):
     status = Column(String(20), default="active")  # active, completed, archived
     
     # Relationships
-    episodes = relationship("Episode", back_populates="story", cascade="all, delete-orphan")
-    
+    episodes = relationship("Episode", back_populates="story", cascade="all, delete-orphan", lazy="selectin")
+
+    # GIN index (Postgres only) backs containment queries against the
+    # character payload; other dialects fall back to a plain index
+    __table_args__ = (
+        Index(
+            "ix_stories_characters_gin",
+            characters_data,
+            postgresql_using="gin",
+        ),
+        # Serialized-release scan: WHERE status=? AND next_release_at<=?
+        Index("ix_stories_release", "status", "next_release_at"),
+    )
+
     def __repr__(self):
         return f"<Story(id='{self.id}', title='{self.title}', episodes={self.completed_episodes}/{self.total_episodes})>"
 
@@ -87,7 +104,7 @@ class Episode(Base):
     tokens_used = Column(Integer, default=0)
     generation_time = Column(Float, default=0.0)
     safety_score = Column(Float, default=1.0)
-    content_warnings = Column(JSON, nullable=True)  # List of warnings
+    content_warnings = Column(JSONVariant, nullable=True)  # List of warnings
     
     # Publication
     status = Column(String(20), default="draft")  # draft, scheduled, published, archived
@@ -95,17 +112,24 @@ class Episode(Base):
     scheduled_for = Column(DateTime, nullable=True)
     
     # Timestamps
-    created_at = Column(DateTime, default=func.now(), nullable=False)
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
     
     # Generation details
     template_used = Column(String(100), nullable=True)
     llm_model = Column(String(50), nullable=True)
-    generation_parameters = Column(JSON, nullable=True)  # temperature, max_tokens, etc.
+    generation_parameters = Column(JSONVariant, nullable=True)  # temperature, max_tokens, etc.
     
     # Relationships
     story = relationship("Story", back_populates="episodes")
-    
+
+    # Composite indexes matched to the real predicates: reading a
+    # story's episodes in order, and the scheduler's due-episode scan
+    __table_args__ = (
+        Index("ix_episodes_story_order", "story_id", "episode_index"),
+        Index("ix_episodes_due", "status", "scheduled_for"),
+    )
+
     def __repr__(self):
         return f"<Episode(id={self.id}, story='{self.story_id}', index={self.episode_index}, status='{self.status}')>"
 
@@ -121,7 +145,7 @@ class GenerationLog(Base):
     
     # Request details
     user_id = Column(String, nullable=False)
-    request_data = Column(JSON, nullable=False)  # Full StoryRequest
+    request_data = Column(JSONVariant, nullable=False)  # Full StoryRequest
     template_name = Column(String(100), nullable=True)
     
     # Generation details
@@ -129,7 +153,7 @@ class GenerationLog(Base):
     llm_model = Column(String(50), nullable=True)
     system_prompt = Column(Text, nullable=True)
     user_prompt = Column(Text, nullable=True)
-    generation_parameters = Column(JSON, nullable=True)
+    generation_parameters = Column(JSONVariant, nullable=True)
     
     # Results
     success = Column(Boolean, default=False)
@@ -139,7 +163,7 @@ class GenerationLog(Base):
     
     # Quality metrics
     safety_score = Column(Float, nullable=True)
-    content_warnings = Column(JSON, nullable=True)
+    content_warnings = Column(JSONVariant, nullable=True)
     word_count = Column(Integer, default=0)
     
     # Error handling
@@ -147,7 +171,7 @@ class GenerationLog(Base):
     retry_count = Column(Integer, default=0)
     
     # Timestamp
-    created_at = Column(DateTime, default=func.now(), nullable=False)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
     
     def __repr__(self):
         status = "✓" if self.success else "✗"
@@ -169,7 +193,7 @@ class ContentModeration(Base):
     # Results
     is_safe = Column(Boolean, default=True)
     safety_score = Column(Float, default=1.0)
-    flagged_categories = Column(JSON, nullable=True)  # List of flagged content types
+    flagged_categories = Column(JSONVariant, nullable=True)  # List of flagged content types
     
     # Actions taken
     action_taken = Column(String(50), nullable=True)  # "none", "filtered", "blocked", "regenerated"
@@ -184,7 +208,7 @@ class ContentModeration(Base):
     review_notes = Column(Text, nullable=True)
     
     # Timestamps
-    created_at = Column(DateTime, default=func.now(), nullable=False)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
     reviewed_at = Column(DateTime, nullable=True)
     
     def __repr__(self):
@@ -204,7 +228,7 @@ class PushSubscriptionDB(Base):
     auth_key = Column(Text, nullable=False)
     
     # Timestamps
-    created_at = Column(DateTime, default=func.now(), nullable=False)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
     
     def __repr__(self):
         return f"<PushSubscription(id={self.id}, user={self.user_id})>"
@@ -222,8 +246,8 @@ class NotificationPreferencesDB(Base):
     email_address = Column(String(255), nullable=True)
     
     # Timestamps
-    created_at = Column(DateTime, default=func.now(), nullable=False)
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
     
     def __repr__(self):
         return f"<NotificationPreferences(user={self.user_id}, email={self.email_notifications}, push={self.webpush_notifications})>"
@@ -244,8 +268,8 @@ class NotificationLogDB(Base):
     error_message = Column(Text, nullable=True)
     
     # Timestamps
-    created_at = Column(DateTime, default=func.now(), nullable=False)
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
     sent_at = Column(DateTime, nullable=True)
     
     def __repr__(self):
@@ -258,7 +282,30 @@ DATABASE_URL = "sqlite:///./story_data/stories.db"
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+try:
+    import orjson
+except ImportError:  # Optional; JSON columns fall back to stdlib json
+    orjson = None
+
+if orjson is not None:
+    # orjson (de)serializes the JSON columns in C, several times faster
+    # than the stdlib default on the big event/preferences payloads
+    _json_engine_kwargs = {
+        "json_serializer": lambda obj: orjson.dumps(obj).decode(),
+        "json_deserializer": orjson.loads,
+    }
+else:
+    _json_engine_kwargs = {}
+
+# query_cache_size keeps compiled SQL for the repeated Story/Episode
+# PK and FK lookups, skipping Core compilation per call
+engine = create_engine(
+    DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    query_cache_size=1200,
+    future=True,
+    **_json_engine_kwargs,
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 # Database dependency
@@ -12,6 +12,13 @@ import logging
 
 from fastapi import FastAPI, HTTPException, Depends, Query, BackgroundTasks
 from fastapi.responses import JSONResponse
+
+try:
+    # orjson serializes responses in C; fall back to stdlib json without it
+    import orjson  # noqa: F401 — required by ORJSONResponse at runtime
+    from fastapi.responses import ORJSONResponse as _DefaultResponseClass
+except ImportError:
+    _DefaultResponseClass = JSONResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import create_engine, and_, or_
 from sqlalchemy.orm import sessionmaker
@@ -54,7 +61,8 @@ Base.metadata.create_all(bind=engine)
 app = FastAPI(
     title="Birds with Friends - Story Engine",
     description="Generate age-appropriate bird stories with life lessons and entertainment",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=_DefaultResponseClass
 )
 
 